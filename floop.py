@@ -19,7 +19,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Import modules from src
 from src.input_handler import process_input
-from src.workflow import run_workflow as run_legacy_workflow
+from src.workflow import run_workflow as run_legacy_workflow, DEFAULT_MAX_CONCURRENCY
 from src.config_workflow import run_workflow as run_configurable_workflow
 from src.output_formatter import format_for_display, format_directory_results, save_results_to_file
 
@@ -37,26 +37,35 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Console banner separator and option choices, built once at import
+_SEP = "=" * 50
+_STRATEGY_CHOICES = click.Choice(['individual', 'concatenate'])
+_MODEL_CHOICES = click.Choice(['chatgpt', 'claude', 'claude-first', 'web_search'])
+_FORMAT_CHOICES = click.Choice(['text', 'markdown', 'json', 'html'])
+
 @click.command()
 @click.option('--input', '-i', help='Direct text input')
 @click.option('--input_file', '-f', help='Path to input file')
 @click.option('--input_directory', '-d', help='Path to input directory')
 @click.option('--file_pattern', default='*.txt', help='File pattern for directory input (default: *.txt)')
 @click.option('--recursive', is_flag=True, help='Search recursively in subdirectories')
-@click.option('--processing_strategy', type=click.Choice(['individual', 'concatenate']), 
+@click.option('--processing_strategy', type=_STRATEGY_CHOICES, 
               default='individual', help='How to process directory files (default: individual)')
 @click.option('--use_chatgpt', is_flag=True, help='Use ChatGPT model')
 @click.option('--use_claude', is_flag=True, help='Use Claude model')
-@click.option('--model', '-m', type=click.Choice(['chatgpt', 'claude', 'claude-first', 'web_search']), 
+@click.option('--model', '-m', type=_MODEL_CHOICES, 
               default=None, help='AI model to use (alternative to --use_* flags)')
 @click.option('--max_tokens', type=int, default=1000, help='Maximum tokens in response')
 @click.option('--temperature', type=float, default=0.7, help='Temperature (randomness)')
 @click.option('--output_file', '-o', help='Path to output file')
-@click.option('--format', '-f', 'format_type', type=click.Choice(['text', 'markdown', 'json', 'html']), 
+@click.option('--format', '-fmt', 'format_type', type=_FORMAT_CHOICES, 
               default='text', help='Output format')
 @click.option('--config', '-c', help='Path to workflow configuration file')
 @click.option('--legacy-mode', is_flag=True, help='Run in legacy mode (ignore configuration)')
 @click.option('--web_search', '-ws', help='Web search query (overrides other input methods)')
+@click.option('--max_concurrency', type=click.IntRange(min=1), default=DEFAULT_MAX_CONCURRENCY,
+              help='Maximum number of directory files processed at once')
+@click.option('--batch', is_flag=True, help='Process directory files as a discounted batch job (may take up to 24 hours)')
 def cli(input: Optional[str] = None, input_file: Optional[str] = None, 
         input_directory: Optional[str] = None, file_pattern: str = '*.txt',
         recursive: bool = False, processing_strategy: str = 'individual',
@@ -64,7 +73,8 @@ def cli(input: Optional[str] = None, input_file: Optional[str] = None,
         model: Optional[str] = None, max_tokens: int = 1000, 
         temperature: float = 0.7, output_file: Optional[str] = None,
         format_type: str = "text", config: Optional[str] = None,
-        legacy_mode: bool = False, web_search: Optional[str] = None):
+        legacy_mode: bool = False, web_search: Optional[str] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY, batch: bool = False):
     """
     Run the Floop AI workflow with the given input and model.
     
@@ -104,7 +114,9 @@ def cli(input: Optional[str] = None, input_file: Optional[str] = None,
             model=model,
             output_file=output_file,
             format_type=format_type,
-            web_search=web_search
+            web_search=web_search,
+            max_concurrency=max_concurrency,
+            batch=batch
         )
     else:
         # Run configurable workflow
@@ -152,11 +164,11 @@ def cli(input: Optional[str] = None, input_file: Optional[str] = None,
                 click.echo(f"Error saving output to file: {str(e)}")
         else:
             # Print to console
-            click.echo("\n" + "="*50)
+            click.echo("\n" + _SEP)
             click.echo(f"Floop Result (model: {result.get('model', 'unknown')})")
-            click.echo("="*50)
+            click.echo(_SEP)
             click.echo(display_output)
-            click.echo("="*50)
+            click.echo(_SEP)
             
             # Print metadata
             click.echo(f"\nMetadata:")
@@ -171,11 +183,11 @@ def cli(input: Optional[str] = None, input_file: Optional[str] = None,
             
             # Print Claude's response if available in legacy mode
             if "claude_response" in result:
-                click.echo("\n" + "="*50)
+                click.echo("\n" + _SEP)
                 click.echo("Claude's Initial Response:")
-                click.echo("="*50)
+                click.echo(_SEP)
                 click.echo(result["claude_response"])
-                click.echo("="*50)
+                click.echo(_SEP)
 
 if __name__ == "__main__":
     cli() 
\ No newline at end of file
@@ -17,6 +17,7 @@ setup(
         "anthropic",
         "python-dotenv",
         "click",
+        "httpx[http2]",
     ],
     entry_points={
         "console_scripts": [
@@ -5,6 +5,7 @@ This module provides functions to interact with OpenAI's ChatGPT API.
 """
 
 import os
+import json
 import logging
 import time
 from typing import Dict, List, Optional, Union, Any
@@ -12,6 +13,13 @@ from openai import OpenAI
 from openai.types.chat import ChatCompletion
 from dotenv import load_dotenv
 
+try:
+    from src.client_utils import TEMP_ERR_RE, make_http_client
+    from src.directory_fanout import DEFAULT_MAX_CONCURRENCY, build_directory_result, process_directory_files
+except ModuleNotFoundError:
+    from client_utils import TEMP_ERR_RE, make_http_client
+    from directory_fanout import DEFAULT_MAX_CONCURRENCY, build_directory_result, process_directory_files
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -22,8 +30,15 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Shared connection pool, sized for concurrent directory requests, so files
+# reuse warm connections instead of opening a new one each
+_http = make_http_client(max_keepalive_connections=16, max_connections=32)
+
 # Initialize the OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=_http)
+
+# Batch job states after which the job will not change any more
+_BATCH_FINAL_STATES = frozenset(("completed", "failed", "expired", "cancelled"))
 
 def call_chatgpt(
     input_data: Union[str, Dict[str, Any]],
@@ -31,7 +46,8 @@ def call_chatgpt(
     max_tokens: int = 1000,
     temperature: float = 0.7,
     max_retries: int = 3,
-    retry_delay: float = 1.0
+    retry_delay: float = 1.0,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
 ) -> Dict[str, Any]:
     """
     Send a request to OpenAI's ChatGPT API and return the response.
@@ -43,6 +59,8 @@ def call_chatgpt(
         temperature: Controls randomness (0-1)
         max_retries: Maximum number of retries for temporary failures
         retry_delay: Delay between retries in seconds
+        max_concurrency: Maximum number of files processed at the same time
+            for individual directory input (1 processes them one by one)
         
     Returns:
         Dictionary containing the response text and metadata
@@ -52,35 +70,16 @@ def call_chatgpt(
         prompt = input_data.get("text", "")
         source = input_data.get("source", "unknown")
         
-        # Handle directory input
+        # Handle directory input with individual file results
         if source == "directory":
-            # If we have individual file results, process each one
-            if "files" in input_data and input_data.get("processing_strategy") == "individual":
-                results = []
-                for file_info in input_data["files"]:
-                    file_path = file_info.get("file_path", "unknown")
-                    content = file_info.get("content", "")
-                    
-                    logger.info(f"Processing file: {file_path}")
-                    file_result = call_chatgpt_single(content, model, max_tokens, temperature, max_retries, retry_delay)
-                    
-                    # Add file path to result
-                    file_result["file_path"] = file_path
-                    results.append(file_result)
-                
-                # Return combined results
-                return {
-                    "results": results,
-                    "model": model,
-                    "input_source": "directory",
-                    "directory_path": input_data.get("directory_path", "unknown"),
-                    "file_count": len(results),
-                    "processing_strategy": "individual",
-                    "metadata": {
-                        "successful_files": sum(1 for r in results if "error" not in r),
-                        "failed_files": sum(1 for r in results if "error" in r)
-                    }
-                }
+            directory_result = process_directory_files(
+                input_data,
+                lambda content: call_chatgpt_single(content, model, max_tokens, temperature, max_retries, retry_delay),
+                model,
+                max_concurrency
+            )
+            if directory_result is not None:
+                return directory_result
     else:
         prompt = input_data
     
@@ -150,10 +149,7 @@ def call_chatgpt_single(
             error_message = str(e)
             
             # Check if the error is temporary (e.g., rate limit, timeout)
-            is_temporary_error = any(
-                error_type in error_message.lower()
-                for error_type in ["timeout", "rate limit", "server error", "503", "429"]
-            )
+            is_temporary_error = TEMP_ERR_RE.search(error_message) is not None
             
             if is_temporary_error and retry_count <= max_retries:
                 # Calculate exponential backoff delay
@@ -174,6 +170,148 @@ def call_chatgpt_single(
         "text": "Sorry, I encountered an error while processing your request."
     }
 
+def call_chatgpt_batch(
+    input_data: Dict[str, Any],
+    model: str = "gpt-3.5-turbo",
+    max_tokens: int = 1000,
+    temperature: float = 0.7,
+    poll_interval: float = 30.0,
+    timeout: float = 24 * 60 * 60
+) -> Dict[str, Any]:
+    """
+    Process the files of an individual directory input through OpenAI's Batch API.
+    
+    The requests are uploaded as one batch job, which is billed at a discount
+    but may take up to 24 hours to complete. This function waits for the job
+    and returns the results in the same layout as call_chatgpt. If the job
+    stops early (it expired, was cancelled, or was cancelled here after the
+    timeout), each file without a response gets its own error.
+    
+    Args:
+        input_data: Directory input from process_input with individual file contents
+        model: The OpenAI model to use (default: gpt-3.5-turbo)
+        max_tokens: Maximum number of tokens in each response
+        temperature: Controls randomness (0-1)
+        poll_interval: Delay between batch status checks in seconds
+        timeout: Maximum time to wait for the batch in seconds
+        
+    Returns:
+        Dictionary containing the per-file results and metadata
+    """
+    files = input_data.get("files", [])
+    if not files:
+        return {"error": "No files to process", "text": "Sorry, I encountered an error while processing your request."}
+    
+    try:
+        # Build one request line per file, identified by its index
+        lines = []
+        for i, file_info in enumerate(files):
+            lines.append(json.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": model,
+                    "messages": [
+                        {"role": "system", "content": "You are a helpful assistant."},
+                        {"role": "user", "content": file_info.get("content", "")}
+                    ],
+                    "max_tokens": max_tokens,
+                    "temperature": temperature
+                }
+            }, ensure_ascii=False))
+        
+        # Upload the requests and start the batch job
+        batch_input = client.files.create(
+            file=("batch_input.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = client.batches.create(
+            input_file_id=batch_input.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info("Submitted batch %s with %d requests", batch.id, len(lines))
+        
+        # Wait for the job to finish
+        deadline = time.monotonic() + timeout
+        missing_error = "No response in batch output"
+        while batch.status not in _BATCH_FINAL_STATES:
+            if time.monotonic() >= deadline:
+                logger.error("Batch %s did not finish in time (status: %s)", batch.id, batch.status)
+                missing_error = f"Batch {batch.id} did not finish in time (status: {batch.status})"
+                # Stop the job so it does not keep running unattended. Requests
+                # that already finished are still reported below.
+                try:
+                    batch = client.batches.cancel(batch.id)
+                except Exception as e:
+                    logger.warning("Failed to cancel batch %s: %s", batch.id, e)
+                break
+            time.sleep(poll_interval)
+            batch = client.batches.retrieve(batch.id)
+        
+        if batch.status == "failed":
+            logger.error("Batch %s ended with status: %s", batch.id, batch.status)
+            return {
+                "error": f"Batch {batch.id} ended with status: {batch.status}",
+                "text": "Sorry, I encountered an error while processing your request."
+            }
+        if batch.status in ("expired", "cancelled"):
+            # Requests that finished before the batch stopped still have results
+            logger.error("Batch %s ended with status: %s", batch.id, batch.status)
+            missing_error = f"Batch {batch.id} ended with status: {batch.status}"
+        
+        # Collect the responses by request index. Failed requests are written
+        # to a separate error file in the same line format.
+        outputs = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                for line in client.files.content(file_id).text.splitlines():
+                    if line:
+                        output = json.loads(line)
+                        outputs[output["custom_id"]] = output
+    
+    except Exception as e:
+        logger.error("Error calling ChatGPT Batch API: %s", e)
+        return {
+            "error": str(e),
+            "text": "Sorry, I encountered an error while processing your request."
+        }
+    
+    # Join the responses back to their source files
+    results = []
+    for i, file_info in enumerate(files):
+        file_path = file_info.get("file_path", "unknown")
+        output = outputs.get(str(i))
+        response = output.get("response") if output else None
+        
+        if response and response.get("status_code") == 200:
+            body = response["body"]
+            usage = body.get("usage", {})
+            results.append({
+                "text": body["choices"][0]["message"]["content"],
+                "model": model,
+                "usage": {
+                    "prompt_tokens": usage.get("prompt_tokens", 0),
+                    "completion_tokens": usage.get("completion_tokens", 0),
+                    "total_tokens": usage.get("total_tokens", 0)
+                },
+                "file_path": file_path
+            })
+        else:
+            error = None
+            if output:
+                error = output.get("error") or (response or {}).get("body", {}).get("error")
+            if isinstance(error, dict):
+                error = error.get("message", error)
+            results.append({
+                "error": str(error or missing_error),
+                "text": "Sorry, I encountered an error while processing your request.",
+                "file_path": file_path
+            })
+    
+    return build_directory_result(results, model, input_data)
+
 # Simple test function
 def test_chatgpt():
     """Test the ChatGPT API with a simple prompt."""
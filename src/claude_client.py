@@ -11,6 +11,13 @@ from typing import Dict, List, Optional, Union, Any
 import anthropic
 from dotenv import load_dotenv
 
+try:
+    from src.client_utils import TEMP_ERR_RE, make_http_client
+    from src.directory_fanout import DEFAULT_MAX_CONCURRENCY, build_directory_result, process_directory_files
+except ModuleNotFoundError:
+    from client_utils import TEMP_ERR_RE, make_http_client
+    from directory_fanout import DEFAULT_MAX_CONCURRENCY, build_directory_result, process_directory_files
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -21,8 +28,15 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Shared connection pool, sized for concurrent directory requests, so files
+# reuse warm connections instead of opening a new one each
+_http = make_http_client(max_keepalive_connections=16, max_connections=32)
+
 # Initialize the Anthropic client
-client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"), http_client=_http)
+
+# Processing status of a message batch that has stopped running
+_BATCH_ENDED = "ended"
 
 def call_claude(
     input_data: Union[str, Dict[str, Any]],
@@ -30,7 +44,8 @@ def call_claude(
     max_tokens: int = 1000,
     temperature: float = 0.7,
     max_retries: int = 3,
-    retry_delay: float = 1.0
+    retry_delay: float = 1.0,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
 ) -> Dict[str, Any]:
     """
     Send a request to Anthropic's Claude API and return the response.
@@ -42,6 +57,8 @@ def call_claude(
         temperature: Controls randomness (0-1)
         max_retries: Maximum number of retries for temporary failures
         retry_delay: Delay between retries in seconds
+        max_concurrency: Maximum number of files processed at the same time
+            for individual directory input (1 processes them one by one)
         
     Returns:
         Dictionary containing the response text and metadata
@@ -51,35 +68,16 @@ def call_claude(
         prompt = input_data.get("text", "")
         source = input_data.get("source", "unknown")
         
-        # Handle directory input
+        # Handle directory input with individual file results
         if source == "directory":
-            # If we have individual file results, process each one
-            if "files" in input_data and input_data.get("processing_strategy") == "individual":
-                results = []
-                for file_info in input_data["files"]:
-                    file_path = file_info.get("file_path", "unknown")
-                    content = file_info.get("content", "")
-                    
-                    logger.info(f"Processing file: {file_path}")
-                    file_result = call_claude_single(content, model, max_tokens, temperature, max_retries, retry_delay)
-                    
-                    # Add file path to result
-                    file_result["file_path"] = file_path
-                    results.append(file_result)
-                
-                # Return combined results
-                return {
-                    "results": results,
-                    "model": model,
-                    "input_source": "directory",
-                    "directory_path": input_data.get("directory_path", "unknown"),
-                    "file_count": len(results),
-                    "processing_strategy": "individual",
-                    "metadata": {
-                        "successful_files": sum(1 for r in results if "error" not in r),
-                        "failed_files": sum(1 for r in results if "error" in r)
-                    }
-                }
+            directory_result = process_directory_files(
+                input_data,
+                lambda content: call_claude_single(content, model, max_tokens, temperature, max_retries, retry_delay),
+                model,
+                max_concurrency
+            )
+            if directory_result is not None:
+                return directory_result
     else:
         prompt = input_data
     
@@ -144,10 +142,7 @@ def call_claude_single(
             error_message = str(e)
             
             # Check if the error is temporary (e.g., rate limit, timeout)
-            is_temporary_error = any(
-                error_type in error_message.lower()
-                for error_type in ["timeout", "rate limit", "server error", "503", "429"]
-            )
+            is_temporary_error = TEMP_ERR_RE.search(error_message) is not None
             
             if is_temporary_error and retry_count <= max_retries:
                 # Calculate exponential backoff delay
@@ -168,6 +163,126 @@ def call_claude_single(
         "text": "Sorry, I encountered an error while processing your request."
     }
 
+def call_claude_batch(
+    input_data: Dict[str, Any],
+    model: str = "claude-3-sonnet-20240229",
+    max_tokens: int = 1000,
+    temperature: float = 0.7,
+    poll_interval: float = 30.0,
+    timeout: float = 24 * 60 * 60
+) -> Dict[str, Any]:
+    """
+    Process the files of an individual directory input through Anthropic's Message Batches API.
+    
+    The requests are sent as one batch job, which is billed at a discount
+    but may take up to 24 hours to complete. This function waits for the job
+    and returns the results in the same layout as call_claude. If the job
+    does not finish before the timeout, it is cancelled.
+    
+    Args:
+        input_data: Directory input from process_input with individual file contents
+        model: The Claude model to use (default: claude-3-sonnet-20240229)
+        max_tokens: Maximum number of tokens in each response
+        temperature: Controls randomness (0-1)
+        poll_interval: Delay between batch status checks in seconds
+        timeout: Maximum time to wait for the batch in seconds
+        
+    Returns:
+        Dictionary containing the per-file results and metadata
+    """
+    files = input_data.get("files", [])
+    if not files:
+        return {"error": "No files to process", "text": "Sorry, I encountered an error while processing your request."}
+    
+    try:
+        # Build one request per file, identified by its index
+        requests = [
+            {
+                "custom_id": str(i),
+                "params": {
+                    "model": model,
+                    "max_tokens": max_tokens,
+                    "temperature": temperature,
+                    "messages": [
+                        {"role": "user", "content": file_info.get("content", "")}
+                    ]
+                }
+            }
+            for i, file_info in enumerate(files)
+        ]
+        
+        # Start the batch job
+        batch = client.messages.batches.create(requests=requests)
+        logger.info("Submitted message batch %s with %d requests", batch.id, len(requests))
+        
+        # Wait for the job to finish
+        deadline = time.monotonic() + timeout
+        while batch.processing_status != _BATCH_ENDED:
+            if time.monotonic() >= deadline:
+                logger.error("Message batch %s did not finish in time (status: %s)", batch.id, batch.processing_status)
+                # Stop the job so it does not keep running unattended
+                try:
+                    client.messages.batches.cancel(batch.id)
+                except Exception as e:
+                    logger.warning("Failed to cancel message batch %s: %s", batch.id, e)
+                return {
+                    "error": f"Message batch {batch.id} did not finish in time (status: {batch.processing_status})",
+                    "text": "Sorry, I encountered an error while processing your request."
+                }
+            time.sleep(poll_interval)
+            batch = client.messages.batches.retrieve(batch.id)
+        
+        # Collect the results by request index
+        outputs = {}
+        for entry in client.messages.batches.results(batch.id):
+            outputs[entry.custom_id] = entry.result
+    
+    except Exception as e:
+        logger.error("Error calling Claude Message Batches API: %s", e)
+        return {
+            "error": str(e),
+            "text": "Sorry, I encountered an error while processing your request."
+        }
+    
+    # Join the results back to their source files
+    results = []
+    for i, file_info in enumerate(files):
+        file_path = file_info.get("file_path", "unknown")
+        result = outputs.get(str(i))
+        
+        error = None
+        if result is None:
+            error = "No result in message batch output"
+        elif result.type == "succeeded":
+            # A message without a text block fails only its own file
+            try:
+                message = result.message
+                results.append({
+                    "text": message.content[0].text,
+                    "model": model,
+                    "usage": {
+                        "input_tokens": message.usage.input_tokens,
+                        "output_tokens": message.usage.output_tokens
+                    },
+                    "file_path": file_path
+                })
+            except Exception as e:
+                logger.error("Error reading message batch result for %s: %s", file_path, e)
+                error = f"Error reading message batch result: {e}"
+        elif result.type == "errored":
+            error = getattr(getattr(result.error, "error", None), "message", None) or str(result.error)
+        else:
+            error = f"Request {result.type}"
+        
+        if error is not None:
+            results.append({
+                "error": error,
+                "text": "Sorry, I encountered an error while processing your request.",
+                "file_path": file_path
+            })
+    
+    return build_directory_result(results, model, input_data)
+
 # Simple test function
 def test_claude():
     """Test the Claude API with a simple prompt."""
@@ -0,0 +1,43 @@
+"""
+Client Utilities Module
+
+This module provides helpers shared by the AI API clients.
+"""
+
+import re
+import atexit
+import httpx
+
+# HTTP/2 needs the optional h2 package (installed with httpx[http2])
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+# Matches error messages for temporary failures that are worth retrying
+TEMP_ERR_RE = re.compile(r'timeout|timed out|rate limit|server error|503|429', re.IGNORECASE)
+
+def make_http_client(max_keepalive_connections: int, max_connections: int) -> httpx.Client:
+    """
+    Create a pooled HTTP client for an API SDK, closed when the interpreter exits.
+
+    No timeout is set, so the SDK using the client keeps its own default
+    request timeout.
+
+    Args:
+        max_keepalive_connections: Maximum number of idle connections kept open
+        max_connections: Maximum number of connections open at the same time
+
+    Returns:
+        The pooled HTTP client
+    """
+    http_client = httpx.Client(
+        http2=_HTTP2,
+        limits=httpx.Limits(
+            max_keepalive_connections=max_keepalive_connections,
+            max_connections=max_connections
+        )
+    )
+    atexit.register(http_client.close)
+    return http_client
@@ -0,0 +1,52 @@
+"""
+Config Loader Module
+
+This module loads workflow configuration files. It has no dependencies on the
+AI clients, so configurations can be read without importing them.
+"""
+
+import json
+import logging
+from typing import Dict, Any, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+def load_config(config_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Load a workflow configuration from a JSON file.
+
+    Args:
+        config_path: Path to the configuration file
+
+    Returns:
+        The parsed configuration as a dictionary, or None if an error occurred
+    """
+    try:
+        try:
+            with open(config_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            logger.error(f"Configuration file not found: {config_path}")
+            return None
+
+        config = orjson.loads(data) if orjson is not None else json.loads(data)
+
+        # Every lookup on the configuration expects a JSON object
+        if not isinstance(config, dict):
+            logger.error(f"Configuration must be a JSON object: {config_path}")
+            return None
+
+        logger.info(f"Successfully loaded configuration from: {config_path}")
+        return config
+
+    except json.JSONDecodeError as e:
+        logger.error(f"Invalid JSON in configuration file: {str(e)}")
+        return None
+    except Exception as e:
+        logger.error(f"Error loading configuration: {str(e)}")
+        return None
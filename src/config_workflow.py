@@ -7,7 +7,6 @@ loaded from JSON configuration files.
 
 import os
 import sys
-import json
 import logging
 import re
 from typing import Dict, Any, Optional, List, Union
@@ -20,6 +19,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 # Import from src package
 try:
     # Try importing as a module first
+    from src.config_loader import load_config
     from src.input_handler import process_input
     from src.chatgpt_client import call_chatgpt
     from src.claude_client import call_claude
@@ -27,6 +27,7 @@ try:
     from src.output_formatter import format_output, format_for_display, save_results_to_file
 except ModuleNotFoundError:
     # If that fails, import directly
+    from config_loader import load_config
     from input_handler import process_input
     from chatgpt_client import call_chatgpt
     from claude_client import call_claude
@@ -43,33 +44,13 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
-def load_config(config_path: str) -> Optional[Dict[str, Any]]:
-    """
-    Load a workflow configuration from a JSON file.
-    
-    Args:
-        config_path: Path to the configuration file
-        
-    Returns:
-        The parsed configuration as a dictionary, or None if an error occurred
-    """
-    try:
-        if not os.path.exists(config_path):
-            logger.error(f"Configuration file not found: {config_path}")
-            return None
-            
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-            
-        logger.info(f"Successfully loaded configuration from: {config_path}")
-        return config
-        
-    except json.JSONDecodeError as e:
-        logger.error(f"Invalid JSON in configuration file: {str(e)}")
-        return None
-    except Exception as e:
-        logger.error(f"Error loading configuration: {str(e)}")
-        return None
+# Separator line used around console output
+_SEP = "=" * 50
+
+# Click option choices, built once at import
+_STRATEGY_CHOICES = click.Choice(('individual', 'concatenate'))
+_MODEL_CHOICES = click.Choice(('chatgpt', 'claude', 'claude-first', 'web_search'))
+_FORMAT_CHOICES = click.Choice(('text', 'markdown', 'json', 'html'))
 
 def get_input_from_config(config: Dict[str, Any], cli_input: Optional[str] = None, 
                          cli_input_file: Optional[str] = None,
@@ -503,14 +484,14 @@ def run_workflow(
 @click.option('--input_directory', '-d', help='Path to input directory')
 @click.option('--file_pattern', default='*.txt', help='File pattern for directory input (default: *.txt)')
 @click.option('--recursive', is_flag=True, help='Search recursively in subdirectories')
-@click.option('--processing_strategy', type=click.Choice(['individual', 'concatenate']), 
+@click.option('--processing_strategy', type=_STRATEGY_CHOICES, 
               default='individual', help='How to process directory files')
-@click.option('--model', '-m', type=click.Choice(['chatgpt', 'claude', 'claude-first', 'web_search']), 
+@click.option('--model', '-m', type=_MODEL_CHOICES, 
               default='chatgpt', help='AI model to use (for legacy mode)')
 @click.option('--max_tokens', type=int, default=1000, help='Maximum tokens in response (for legacy mode)')
 @click.option('--temperature', type=float, default=0.7, help='Temperature (for legacy mode)')
 @click.option('--output_file', '-o', help='Path to output file')
-@click.option('--format', 'format_type', type=click.Choice(['text', 'markdown', 'json', 'html']), 
+@click.option('--format', 'format_type', type=_FORMAT_CHOICES, 
               default='text', help='Output format')
 @click.option('--config', '-c', 'config_path', help='Path to workflow configuration file')
 @click.option('--legacy-mode', is_flag=True, help='Run in legacy mode (ignore configuration)')
@@ -552,21 +533,24 @@ def cli(input: Optional[str] = None, input_file: Optional[str] = None,
     if not output_file and result.get("output", {}).get("output_type") != "file":
         display_output = result.get("output", {}).get("output", result.get("result", ""))
         
-        click.echo("\n" + "="*50)
-        click.echo(f"Workflow Result (model: {result['model']})")
-        click.echo("="*50)
-        click.echo(display_output)
-        click.echo("="*50)
-        
-        # Print metadata
-        click.echo(f"\nMetadata:")
-        click.echo(f"- Model: {result['metadata']['model_info']}")
-        click.echo(f"- Input source: {result['input_source']}")
-        click.echo(f"- Token usage: {result['metadata']['usage']}")
+        # Collect the report and print it with a single write
+        out = [
+            f"\n{_SEP}",
+            f"Workflow Result (model: {result['model']})",
+            _SEP,
+            "" if display_output is None else str(display_output),
+            _SEP,
+            f"\nMetadata:",
+            f"- Model: {result['metadata']['model_info']}",
+            f"- Input source: {result['input_source']}",
+            f"- Token usage: {result['metadata']['usage']}",
+        ]
         
-        # Print steps if available
+        # Add steps if available
         if "steps" in result:
-            click.echo(f"- Steps: {', '.join(result['steps'])}")
+            out.append(f"- Steps: {', '.join(result['steps'])}")
+            
+        click.echo("\n".join(out))
 
 if __name__ == "__main__":
     # Run the CLI if this file is executed directly
@@ -0,0 +1,109 @@
+"""
+Directory Fan-out Module
+
+This module sends the files of an individual directory input to a model
+client concurrently and combines the per-file responses into one result.
+"""
+
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default number of files sent to the API at the same time for directory input
+DEFAULT_MAX_CONCURRENCY = 8
+
+def build_directory_result(
+    results: List[Dict[str, Any]],
+    model: str,
+    input_data: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Combine per-file responses into the result of an individual directory input.
+
+    Args:
+        results: The per-file responses, each with its "file_path"
+        model: The model name reported in the combined result
+        input_data: The directory input the responses belong to
+
+    Returns:
+        Dictionary containing the per-file results and metadata
+    """
+    return {
+        "results": results,
+        "model": model,
+        "input_source": "directory",
+        "directory_path": input_data.get("directory_path", "unknown"),
+        "file_count": len(results),
+        "processing_strategy": "individual",
+        "metadata": {
+            "successful_files": sum(1 for r in results if "error" not in r),
+            "failed_files": sum(1 for r in results if "error" in r)
+        }
+    }
+
+def process_directory_files(
+    input_data: Dict[str, Any],
+    call_single: Callable[[str], Dict[str, Any]],
+    model: str,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+) -> Optional[Dict[str, Any]]:
+    """
+    Send each file of an individual directory input to a model.
+
+    Args:
+        input_data: Directory input from process_input, with a "files" list or,
+            for lazily read directories, a "files_iter" generator and "files_found"
+        call_single: Function that sends one prompt to the model and returns its response
+        model: The model name reported in the combined result
+        max_concurrency: Maximum number of files processed at the same time
+            (1 processes them one by one)
+
+    Returns:
+        Dictionary containing the per-file results and metadata (file_count is
+        the number of files read), an error if no file of a lazily read
+        directory could be read, or None if the input is not an individual
+        directory input
+    """
+    files = input_data.get("files")
+    lazy = files is None
+    if lazy:
+        files = input_data.get("files_iter")
+    if files is None or input_data.get("processing_strategy") != "individual":
+        return None
+
+    def process_file(file_info: Dict[str, Any]) -> Dict[str, Any]:
+        file_path = file_info.get("file_path", "unknown")
+
+        logger.info("Processing file: %s", file_path)
+        file_result = call_single(file_info.get("content", ""))
+
+        # Add file path to result
+        file_result["file_path"] = file_path
+        return file_result
+
+    # Each file is an independent API request, so send them concurrently. At
+    # most two requests per worker are queued, so a files_iter is only read a
+    # few files ahead; results are collected oldest first to keep file order.
+    file_count = len(files) if isinstance(files, list) else input_data.get("files_found", max_concurrency)
+    workers = min(file_count, max_concurrency)
+    if workers > 1:
+        results = []
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for file_info in files:
+                if len(pending) >= workers * 2:
+                    results.append(pending.popleft().result())
+                pending.append(executor.submit(process_file, file_info))
+            results.extend(future.result() for future in pending)
+    else:
+        results = [process_file(file_info) for file_info in files]
+
+    # A lazily read directory only finds out here whether any file was readable
+    if lazy and not results:
+        logger.error("Failed to read any files in the directory")
+        return {"error": "Failed to read any files in the directory", "text": None}
+
+    return build_directory_result(results, model, input_data)
@@ -5,10 +5,16 @@ This module provides functions to handle input from CLI, files, and directories.
 """
 
 import os
+import re
 import sys
+import mmap
+import stat
 import glob
+import fnmatch
+import functools
 import logging
-from typing import Optional, Dict, Any, List
+from codecs import utf_8_decode
+from typing import Optional, Dict, Any, List, Iterable, Iterator
 import click
 
 # Configure logging
@@ -18,6 +24,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Files up to this size are read with a single os.read on a raw descriptor,
+# bypassing the buffered file object
+_RAW_READ_MAX_SIZE = 64 * 1024
+_RAW_READ_FLAGS = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+
+# When concatenating a directory, files of at least this size are memory-mapped
+# so their pages are joined straight from the page cache instead of copied twice
+_MMAP_MIN_SIZE = 1024 * 1024
+
+# Matches content that strip() would reduce to nothing, without copying a mapping
+_BLANK_RE = re.compile(rb'\s*')
+
 def get_text_input(prompt: str = "Enter your prompt: ") -> str:
     """
     Get text input from the user via CLI.
@@ -38,44 +56,121 @@ def get_text_input(prompt: str = "Enter your prompt: ") -> str:
         logger.error(f"Error getting text input: {str(e)}")
         return ""
 
-def read_file(file_path: str) -> Optional[str]:
+def _normalize_newlines(raw: bytes) -> bytes:
     """
-    Read content from a file.
+    Translate \r\n and \r line endings to \n, as text-mode open() would.
+    
+    Args:
+        raw: The raw file content
+        
+    Returns:
+        The content with normalized line endings
+    """
+    if b'\r' not in raw:
+        return raw
+    return raw.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+
+def read_file_bytes(file_path: str) -> Optional[bytes]:
+    """
+    Read raw content from a file without decoding it.
     
     Args:
         file_path: Path to the file to read
         
     Returns:
-        The file content as a string, or None if an error occurred
+        The file content as bytes, or None if an error occurred
+    """
+    return _read_file_content(file_path)
+
+def _read_file_content(file_path: str, map_large: bool = False):
+    """
+    Read raw content from a file, optionally memory-mapping large files.
+    
+    Args:
+        file_path: Path to the file to read
+        map_large: Return a read-only mmap instead of bytes for files of at
+            least _MMAP_MIN_SIZE bytes; the caller must close it (default: False)
+        
+    Returns:
+        The file content as bytes or an mmap, or None if an error occurred
     """
     try:
-        # Check if file exists
-        if not os.path.exists(file_path):
+        # Check that the file exists and is a regular file with a single stat call
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
             logger.error(f"File not found: {file_path}")
             return None
             
-        # Check if file is readable
-        if not os.path.isfile(file_path):
+        if not stat.S_ISREG(st.st_mode):
             logger.error(f"Not a file: {file_path}")
             return None
             
         # Read file content
-        logger.info(f"Reading file: {file_path}")
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
+        logger.info("Reading file: %s", file_path)
+        if 0 < st.st_size <= _RAW_READ_MAX_SIZE:
+            fd = os.open(file_path, _RAW_READ_FLAGS)
+            try:
+                content = os.read(fd, st.st_size)
+            finally:
+                os.close(fd)
+        else:
+            with open(file_path, 'rb') as file:
+                if map_large and st.st_size >= _MMAP_MIN_SIZE:
+                    content = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                    if not _BLANK_RE.fullmatch(content):
+                        logger.info("Mapped file: %s (%d bytes)", file_path, len(content))
+                        return content
+                    content.close()
+                    content = b""
+                else:
+                    content = file.read()
             
         # Check if file is empty
         if not content.strip():
             logger.warning(f"File is empty: {file_path}")
-            return ""
+            return b""
             
-        logger.info(f"Successfully read file: {file_path} ({len(content)} characters)")
+        logger.info("Successfully read file: %s (%d bytes)", file_path, len(content))
         return content
         
     except Exception as e:
         logger.error(f"Error reading file: {str(e)}")
         return None
 
+def read_file(file_path: str) -> Optional[str]:
+    """
+    Read content from a file.
+    
+    Args:
+        file_path: Path to the file to read
+        
+    Returns:
+        The file content as a string, or None if an error occurred
+    """
+    content = read_file_bytes(file_path)
+    if content is None:
+        return None
+        
+    try:
+        return utf_8_decode(_normalize_newlines(content), 'strict', True)[0]
+    except UnicodeDecodeError as e:
+        logger.error(f"Error reading file: {str(e)}")
+        return None
+
+@functools.lru_cache(maxsize=32)
+def _compile_glob(pattern: str):
+    """
+    Translate a glob pattern into a compiled regular expression.
+    
+    Args:
+        pattern: The glob pattern to translate
+        
+    Returns:
+        The compiled regular expression
+    """
+    return re.compile(fnmatch.translate(os.path.normcase(pattern)))
+
 def find_files_in_directory(directory_path: str, file_pattern: str = "*.txt", recursive: bool = False) -> List[str]:
     """
     Find files in a directory matching a pattern.
@@ -89,21 +184,61 @@ def find_files_in_directory(directory_path: str, file_pattern: str = "*.txt", re
         List of file paths matching the pattern
     """
     try:
-        if not os.path.exists(directory_path):
+        try:
+            st = os.stat(directory_path)
+        except FileNotFoundError:
             logger.error(f"Directory not found: {directory_path}")
             return []
             
-        if not os.path.isdir(directory_path):
+        if not stat.S_ISDIR(st.st_mode):
             logger.error(f"Not a directory: {directory_path}")
             return []
             
-        # Construct the search pattern
-        if recursive:
-            search_pattern = os.path.join(directory_path, "**", file_pattern)
-            files = glob.glob(search_pattern, recursive=True)
+        # Patterns spanning several path components still need glob
+        if os.sep in file_pattern or (os.altsep and os.altsep in file_pattern):
+            if recursive:
+                search_pattern = os.path.join(directory_path, "**", file_pattern)
+                files = glob.glob(search_pattern, recursive=True)
+            else:
+                search_pattern = os.path.join(directory_path, file_pattern)
+                files = glob.glob(search_pattern)
         else:
-            search_pattern = os.path.join(directory_path, file_pattern)
-            files = glob.glob(search_pattern)
+            # Walk the tree with scandir, matching entry names against the
+            # cached pattern. Like glob, hidden entries only match patterns
+            # that start with a dot, hidden directories are not descended and
+            # symlinked directories are followed. Each directory carries the
+            # (device, inode) pairs of its ancestors so symlink loops are
+            # not followed forever.
+            match = _compile_glob(file_pattern).match
+            include_hidden = file_pattern.startswith('.')
+            files = []
+            pending = [(directory_path, frozenset(((st.st_dev, st.st_ino),)))]
+            while pending:
+                current, ancestors = pending.pop()
+                try:
+                    entries = os.scandir(current)
+                except OSError as e:
+                    if current == directory_path:
+                        raise
+                    logger.warning("Skipping unreadable directory %s: %s", current, e)
+                    continue
+                    
+                with entries:
+                    for entry in entries:
+                        hidden = entry.name.startswith('.')
+                        if recursive and not hidden and entry.is_dir():
+                            try:
+                                dir_stat = entry.stat()
+                            except OSError as e:
+                                logger.warning("Skipping unreadable directory %s: %s", entry.path, e)
+                            else:
+                                dir_id = (dir_stat.st_dev, dir_stat.st_ino)
+                                if dir_id in ancestors:
+                                    logger.warning("Skipping symlink loop at %s", entry.path)
+                                else:
+                                    pending.append((entry.path, ancestors | {dir_id}))
+                        if (include_hidden or not hidden) and match(os.path.normcase(entry.name)) and entry.is_file():
+                            files.append(entry.path)
             
         logger.info(f"Found {len(files)} files matching pattern '{file_pattern}' in {directory_path}")
         return sorted(files)
@@ -112,8 +247,27 @@ def find_files_in_directory(directory_path: str, file_pattern: str = "*.txt", re
         logger.error(f"Error finding files in directory: {str(e)}")
         return []
 
+def iter_directory_files(files: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Read files one at a time, skipping files that cannot be read.
+    
+    Args:
+        files: Paths of the files to read
+        
+    Yields:
+        Dictionaries with the file path and content of each readable file
+    """
+    for file_path in files:
+        content = read_file(file_path)
+        if content is not None:
+            yield {
+                "file_path": file_path,
+                "content": content
+            }
+
 def process_directory(directory_path: str, file_pattern: str = "*.txt", 
-                     recursive: bool = False, processing_strategy: str = "individual") -> Dict[str, Any]:
+                     recursive: bool = False, processing_strategy: str = "individual",
+                     lazy: bool = False) -> Dict[str, Any]:
     """
     Process files in a directory according to a strategy.
     
@@ -122,6 +276,9 @@ def process_directory(directory_path: str, file_pattern: str = "*.txt",
         file_pattern: Glob pattern for files to match (default: "*.txt")
         recursive: Whether to search recursively in subdirectories (default: False)
         processing_strategy: How to process the files - "individual" or "concatenate" (default: "individual")
+        lazy: For the individual strategy, return a "files_iter" generator that
+            reads each file when it is consumed, and the number of matching
+            files as "files_found", instead of a "files" list (default: False)
         
     Returns:
         Dictionary containing the processed input and metadata
@@ -135,17 +292,48 @@ def process_directory(directory_path: str, file_pattern: str = "*.txt",
         # Concatenate all file contents into a single string
         all_content = []
         file_paths = []
+        mapped = []
         
-        for file_path in files:
-            content = read_file(file_path)
-            if content is not None:
+        try:
+            for file_path in files:
+                content = _read_file_content(file_path, map_large=True)
+                if content is None:
+                    continue
+                if isinstance(content, mmap.mmap):
+                    mapped.append(content)
+                    if content.find(b'\r') != -1:
+                        content = _normalize_newlines(content[:])
+                else:
+                    content = _normalize_newlines(content)
                 all_content.append(content)
                 file_paths.append(file_path)
+                    
+            if not all_content:
+                return {"error": "Failed to read any files in the directory", "text": None}
                 
-        if not all_content:
-            return {"error": "Failed to read any files in the directory", "text": None}
+            # Join the raw contents and decode the combined buffer once
+            try:
+                combined_content, _ = utf_8_decode(b"\n\n--- Next File ---\n\n".join(all_content), 'strict', True)
+            except UnicodeDecodeError:
+                # Fall back to decoding file by file so undecodable files are skipped
+                decoded_content = []
+                decoded_paths = []
+                for file_path, content in zip(file_paths, all_content):
+                    try:
+                        decoded_content.append(utf_8_decode(content, 'strict', True)[0])
+                        decoded_paths.append(file_path)
+                    except UnicodeDecodeError as e:
+                        logger.error(f"Error reading file: {str(e)}")
+                        
+                if not decoded_content:
+                    return {"error": "Failed to read any files in the directory", "text": None}
+                    
+                combined_content = "\n\n--- Next File ---\n\n".join(decoded_content)
+                file_paths = decoded_paths
+        finally:
+            for mm in mapped:
+                mm.close()
             
-        combined_content = "\n\n--- Next File ---\n\n".join(all_content)
         return {
             "text": combined_content, 
             "source": "directory", 
@@ -155,16 +343,21 @@ def process_directory(directory_path: str, file_pattern: str = "*.txt",
             "processing_strategy": "concatenate"
         }
     elif processing_strategy == "individual":
+        if lazy:
+            # Hand out the files one at a time so only the files being
+            # processed are held in memory. How many can be read is only
+            # known once the iterator is consumed, so files_found is the
+            # number matched, not a file_count.
+            return {
+                "files_iter": iter_directory_files(files),
+                "source": "directory",
+                "directory_path": directory_path,
+                "files_found": len(files),
+                "processing_strategy": "individual"
+            }
+            
         # Return a list of individual file contents
-        file_contents = []
-        
-        for file_path in files:
-            content = read_file(file_path)
-            if content is not None:
-                file_contents.append({
-                    "file_path": file_path,
-                    "content": content
-                })
+        file_contents = list(iter_directory_files(files))
                 
         if not file_contents:
             return {"error": "Failed to read any files in the directory", "text": None}
@@ -181,7 +374,8 @@ def process_directory(directory_path: str, file_pattern: str = "*.txt",
 
 def process_input(input_text: Optional[str] = None, input_file: Optional[str] = None, 
                  input_directory: Optional[str] = None, file_pattern: str = "*.txt",
-                 recursive: bool = False, processing_strategy: str = "individual") -> Dict[str, Any]:
+                 recursive: bool = False, processing_strategy: str = "individual",
+                 lazy: bool = False) -> Dict[str, Any]:
     """
     Process input from text, file, or directory.
     
@@ -192,13 +386,14 @@ def process_input(input_text: Optional[str] = None, input_file: Optional[str] =
         file_pattern: Glob pattern for files to match when using directory input
         recursive: Whether to search recursively in subdirectories
         processing_strategy: How to process directory files - "individual" or "concatenate"
+        lazy: Read individual directory files on demand (see process_directory)
         
     Returns:
         Dictionary containing the processed input and metadata
     """
     # Check input priority: directory > file > text
     if input_directory is not None:
-        return process_directory(input_directory, file_pattern, recursive, processing_strategy)
+        return process_directory(input_directory, file_pattern, recursive, processing_strategy, lazy)
         
     # Check if both text and file inputs are None
     if input_text is None and input_file is None:
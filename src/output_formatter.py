@@ -6,17 +6,132 @@ This module provides functions to format and clean output from AI models.
 
 import re
 import os
+import html
 import logging
 import json
-from typing import Dict, Any, Optional, List
+import functools
+import concurrent.futures
+from itertools import repeat
+from typing import Dict, Any, Optional, List, Iterator, Iterable
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Logging is configured by the entry point that runs the workflow
 logger = logging.getLogger(__name__)
 
+_escape = html.escape
+
+# File names shown in directory reports, cached per unique path
+_basename = functools.lru_cache(maxsize=4096)(os.path.basename)
+
+# Escapes text the same way as html.escape and converts newlines to HTML
+# line breaks in a single pass
+_HTML_ESC_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;',
+    '\n': '<br>',
+})
+
+# Output directories already created by save_results_to_file
+_ensured_dirs = set()
+
+# Result batches smaller than this are cleaned serially, since process
+# start-up and pickling would outweigh the gain
+_PARALLEL_CLEAN_MIN_RESULTS = 8
+_PARALLEL_CLEAN_MIN_CHARS = 1024 * 1024
+_PARALLEL_CLEAN_MIN_AVG_CHARS = 4 * 1024
+
+# Process pool for cleaning large result batches, created on first use
+_clean_pool = None
+
+# Whitespace runs collapsed by clean_text; the horizontal-only variant keeps newlines
+_WS_RE = re.compile(r'\s+')
+_WS_MULTI_RE = re.compile(r'[^\S\n]+')
+_LINE_EDGE_RE = re.compile(r' ?\n ?')
+
+# Whitespace that clean_text would rewrite: anything other than single spaces
+# between words (and, when line breaks are preserved, bare newlines)
+_MESSY_WS_RE = re.compile(r'[^\S ]|  ')
+_MESSY_LINE_WS_RE = re.compile(r'[^\S \n]|  | \n|\n ')
+
+# Characters accepted as the end of a sentence by clean_text
+_SENTENCE_ENDS = frozenset('.!?:;')
+
+# Static HTML scaffolding; only the dynamic fragments are built per call
+_HTML_SINGLE_HEADER = """<!DOCTYPE html>
+<html>
+<head>
+    <title>AI Response</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; }
+        h1, h2, h3 { color: #333; }
+        .response { padding: 10px; background-color: #f9f9f9; border-radius: 5px; }
+        .metadata { font-style: italic; color: #666; }
+        .step { margin-bottom: 15px; }
+        .step-output { padding: 10px; background-color: #f0f8ff; border-radius: 5px; margin-bottom: 20px; border-left: 3px solid #4682b4; }
+    </style>
+</head>
+<body>
+    <h1>AI Response</h1>
+"""
+
+_HTML_SINGLE_FOOTER = """    <p class="metadata">Generated by {model}</p>
+</body>
+</html>"""
+
+_HTML_DIR_HEADER = """<!DOCTYPE html>
+<html>
+<head>
+    <title>Directory Processing Results</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; }
+        h1, h2 { color: #333; }
+        .summary { padding: 10px; background-color: #f0f0f0; border-radius: 5px; margin-bottom: 20px; }
+        .file-result { padding: 10px; background-color: #f9f9f9; border-radius: 5px; margin-bottom: 15px; }
+        .file-path { color: #666; font-style: italic; }
+        .error { color: #cc0000; }
+    </style>
+</head>
+<body>
+    <h1>Directory Processing Results</h1>
+"""
+
+_HTML_DIR_SUMMARY = """    <div class="summary">
+        <p><strong>Directory:</strong> {directory_path}</p>
+        <p><strong>Files Processed:</strong> {file_count}</p>
+        <p><strong>Successful:</strong> {successful}</p>
+        <p><strong>Failed:</strong> {failed}</p>
+        <p><strong>Model:</strong> {model}</p>
+    </div>
+"""
+
+_HTML_DIR_FOOTER = "</body>\n</html>"
+
+_MD_DIR_HEADER = """# Directory Processing Results
+
+**Directory:** {directory_path}
+**Files Processed:** {file_count}
+**Successful:** {successful}
+**Failed:** {failed}
+**Model:** {model}
+
+"""
+
+_TEXT_DIR_HEADER = """Directory Processing Results
+Directory: {directory_path}
+Files Processed: {file_count}
+Successful: {successful}
+Failed: {failed}
+Model: {model}
+
+"""
+
 def clean_text(text: str, preserve_line_breaks: bool = True) -> str:
     """
     Clean and format text by removing unnecessary whitespace and fixing formatting issues.
@@ -31,25 +146,82 @@ def clean_text(text: str, preserve_line_breaks: bool = True) -> str:
     if not text:
         return ""
     
+    # Return already clean text as-is without running the substitution.
+    # Printable text holds no whitespace other than plain spaces, so a
+    # single line without double spaces can skip the regex check entirely.
+    if text == text.strip():
+        simple = text.isprintable() and '  ' not in text
+        if preserve_line_breaks:
+            if simple or not _MESSY_LINE_WS_RE.search(text):
+                return text
+        elif text[-1] in _SENTENCE_ENDS and (simple or not _MESSY_WS_RE.search(text)):
+            return text
+    
     if preserve_line_breaks:
         # Preserve line breaks but remove excessive horizontal whitespace
-        lines = text.split('\n')
-        cleaned_lines = [re.sub(r'\s+', ' ', line).strip() for line in lines]
-        cleaned = '\n'.join(cleaned_lines)
+        # and the single spaces left at either end of each line
+        cleaned = _LINE_EDGE_RE.sub('\n', _WS_MULTI_RE.sub(' ', text))
     else:
         # Remove excessive whitespace (both horizontal and vertical)
-        cleaned = re.sub(r'\s+', ' ', text)
+        cleaned = _WS_RE.sub(' ', text)
     
     # Fix common formatting issues
     cleaned = cleaned.strip()
     
     # Ensure proper sentence endings for non-markdown content
-    if not preserve_line_breaks and cleaned and not cleaned.endswith(('.', '!', '?', ':', ';')):
+    if not preserve_line_breaks and cleaned and cleaned[-1] not in _SENTENCE_ENDS:
         cleaned += '.'
         
-    logger.debug(f"Cleaned text (length: {len(cleaned)})")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Cleaned text (length: %d)", len(cleaned))
     return cleaned
 
+def _get_clean_pool() -> concurrent.futures.ProcessPoolExecutor:
+    """
+    Get the process pool used to clean large result batches, creating it on first use.
+    
+    Returns:
+        The shared process pool
+    """
+    global _clean_pool
+    if _clean_pool is None:
+        _clean_pool = concurrent.futures.ProcessPoolExecutor()
+    return _clean_pool
+
+def _reset_clean_pool() -> None:
+    """
+    Discard the process pool after a failure, so the next large batch starts a fresh one.
+    """
+    global _clean_pool
+    pool, _clean_pool = _clean_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False)
+
+def _clean_texts(texts: List[str], preserve_line_breaks: bool) -> List[str]:
+    """
+    Clean a batch of texts, spreading large batches across processes.
+    
+    Args:
+        texts: The texts to clean
+        preserve_line_breaks: Whether to preserve line breaks
+        
+    Returns:
+        The cleaned texts, in the same order
+    """
+    # The regex engine holds the GIL, so batches go to processes rather than threads
+    total_chars = sum(len(text) for text in texts if text) if len(texts) >= _PARALLEL_CLEAN_MIN_RESULTS else 0
+    if (total_chars >= _PARALLEL_CLEAN_MIN_CHARS
+            and total_chars // len(texts) >= _PARALLEL_CLEAN_MIN_AVG_CHARS):
+        try:
+            chunksize = max(1, len(texts) // (os.cpu_count() or 1))
+            return list(_get_clean_pool().map(clean_text, texts, repeat(preserve_line_breaks),
+                                              chunksize=chunksize))
+        except Exception as e:
+            logger.warning("Parallel text cleaning failed, falling back to serial: %s", e)
+            _reset_clean_pool()
+            
+    return [clean_text(text, preserve_line_breaks) for text in texts]
+
 def format_output(response: Dict[str, Any], include_metadata: bool = True, format_type: str = "text") -> Dict[str, Any]:
     """
     Format the output from an AI model.
@@ -66,17 +238,23 @@ def format_output(response: Dict[str, Any], include_metadata: bool = True, forma
         logger.warning("Invalid response format")
         return response
     
+    # JSON output carries the response as-is, so there is nothing to clean
+    if format_type == "json":
+        logger.info("Output formatted successfully")
+        return response
+    
     # Determine if we should preserve line breaks (for markdown and html formats)
     preserve_line_breaks = format_type in ["markdown", "html"]
         
     # Check if this is a directory result with multiple files
     if "results" in response:
-        # Format each individual result
-        for i, file_result in enumerate(response["results"]):
-            if "text" in file_result:
-                file_result["text"] = clean_text(file_result["text"], preserve_line_breaks)
+        # Format each individual result, skipping empty texts
+        text_results = [file_result for file_result in response["results"] if file_result.get("text")]
+        cleaned = _clean_texts([file_result["text"] for file_result in text_results], preserve_line_breaks)
+        for file_result, text in zip(text_results, cleaned):
+            file_result["text"] = text
                 
-        logger.info(f"Formatted {len(response['results'])} file results")
+        logger.info("Formatted %d file results", len(response['results']))
         return response
     
     # Single result processing
@@ -91,30 +269,52 @@ def format_output(response: Dict[str, Any], include_metadata: bool = True, forma
     logger.info("Output formatted successfully")
     return response
 
-def format_for_display(response: Dict[str, Any], format_type: str = "text") -> str:
+def _step_details(response: Dict[str, Any], steps: List[str]) -> List[tuple]:
     """
-    Format the response for display in the specified format.
+    Look up the task, model and step info of each workflow step once.
+    
+    Args:
+        response: The response from the AI model
+        steps: The names of the workflow steps
+        
+    Returns:
+        List of (step, task, model, step_info) tuples
+    """
+    details = []
+    for step in steps:
+        step_info = response.get(step, {})
+        details.append((step, step_info.get("task", step), step_info.get("model", "unknown"), step_info))
+    return details
+
+def _iter_for_display(response: Dict[str, Any], format_type: str = "text") -> Iterable[str]:
+    """
+    Format the response for display in the specified format as a sequence of chunks.
     
     Args:
         response: The response from the AI model
         format_type: The format to use (text, markdown, json, html)
         
     Returns:
-        The formatted output as a string
+        The formatted output as an iterable of string chunks
     """
     if not response:
-        return "No response available."
+        return ["No response available."]
         
     if "error" in response:
-        return f"Error: {response['error']}"
+        return [f"Error: {response['error']}"]
     
     # Check if this is a directory result with multiple files
     if "results" in response:
-        return format_directory_results(response, format_type)
+        return _iter_directory_results(response, format_type)
     
     # Get the response text
     response_text = response.get("text", "")
     
+    # Plain text needs none of the metadata below
+    if format_type == "text":
+        logger.info("Output formatted for display (%s)", format_type)
+        return [response_text]
+    
     # Get model information
     model_info = response.get("model_info", response.get("model", "unknown"))
     
@@ -125,237 +325,223 @@ def format_for_display(response: Dict[str, Any], format_type: str = "text") -> s
     # Get steps information if available
     steps = response.get("steps", [])
     
-    if format_type == "text":
-        # Simple text format
-        output = response_text
-    elif format_type == "markdown":
+    if format_type == "markdown":
         # Markdown format with metadata
-        output = f"# AI Response\n\n"
+        parts = ["# AI Response\n\n"]
+        append = parts.append
         
         # Add workflow information if available
         if steps:
-            output += f"## Workflow Steps\n\n"
-            for step in steps:
-                step_info = response.get(step, {})
-                step_model = step_info.get("model", "unknown")
-                step_task = step_info.get("task", step)
-                output += f"- **{step}**: {step_task} (using {step_model})\n"
-            output += "\n"
+            append("## Workflow Steps\n\n")
+            details = _step_details(response, steps)
+            for step, step_task, step_model, _ in details:
+                append(f"- **{step}**: {step_task} (using {step_model})\n")
+            append("\n")
             
             # Add each step's output for debugging purposes
-            output += f"## Step Outputs\n\n"
-            for step in steps:
-                step_info = response.get(step, {})
-                step_task = step_info.get("task", step)
-                step_model = step_info.get("model", "unknown")
+            append("## Step Outputs\n\n")
+            for step, step_task, step_model, step_info in details:
                 step_output = step_info.get("output", "No output available")
                 
-                output += f"### {step}: {step_task}\n\n"
-                output += f"**Model**: {step_model}\n\n"
-                output += f"**Output**:\n\n{step_output}\n\n"
-                output += "---\n\n"
+                append(f"### {step}: {step_task}\n\n"
+                       f"**Model**: {step_model}\n\n"
+                       f"**Output**:\n\n{step_output}\n\n"
+                       "---\n\n")
         else:
             # If there are no steps, just show the result
             # Add current step information if available
             if step_name and task:
-                output += f"## Step: {step_name}\n\n"
-                output += f"**Task**: {task}\n\n"
+                append(f"## Step: {step_name}\n\n**Task**: {task}\n\n")
             
             # Add the main response - preserve line breaks for markdown
-            output += f"## Result\n\n{response_text}\n\n"
+            append(f"## Result\n\n{response_text}\n\n")
         
         # Add metadata
-        output += f"*Generated by {model_info}*"
+        append(f"*Generated by {model_info}*")
     elif format_type == "json":
         # JSON format
-        output = json.dumps(response, indent=2)
+        parts = [json.dumps(response, indent=2, separators=(',', ': '), ensure_ascii=False)]
     elif format_type == "html":
-        # HTML format
-        html_response = response_text.replace('\n', '<br>')
-        
-        output = '<!DOCTYPE html>\n'
-        output += '<html>\n'
-        output += '<head>\n'
-        output += '    <title>AI Response</title>\n'
-        output += '    <style>\n'
-        output += '        body { font-family: Arial, sans-serif; margin: 20px; }\n'
-        output += '        h1, h2, h3 { color: #333; }\n'
-        output += '        .response { padding: 10px; background-color: #f9f9f9; border-radius: 5px; }\n'
-        output += '        .metadata { font-style: italic; color: #666; }\n'
-        output += '        .step { margin-bottom: 15px; }\n'
-        output += '        .step-output { padding: 10px; background-color: #f0f8ff; border-radius: 5px; margin-bottom: 20px; border-left: 3px solid #4682b4; }\n'
-        output += '    </style>\n'
-        output += '</head>\n'
-        output += '<body>\n'
-        output += '    <h1>AI Response</h1>\n'
+        # HTML format - escape dynamic fields and convert line breaks in one pass
+        html_response = response_text.translate(_HTML_ESC_TABLE)
+        parts = [_HTML_SINGLE_HEADER]
+        append = parts.append
         
         # Add workflow information if available
         if steps:
-            output += '    <h2>Workflow Steps</h2>\n'
-            output += '    <ul>\n'
-            for step in steps:
-                step_info = response.get(step, {})
-                step_model = step_info.get("model", "unknown")
-                step_task = step_info.get("task", step)
-                output += f'        <li><strong>{step}</strong>: {step_task} (using {step_model})</li>\n'
-            output += '    </ul>\n'
+            append('    <h2>Workflow Steps</h2>\n')
+            append('    <ul>\n')
+            details = _step_details(response, steps)
+            for step, step_task, step_model, _ in details:
+                append(f'        <li><strong>{_escape(step)}</strong>: {_escape(step_task)} (using {_escape(step_model)})</li>\n')
+            append('    </ul>\n')
             
             # Add each step's output for debugging purposes
-            output += '    <h2>Step Outputs</h2>\n'
-            for step in steps:
-                step_info = response.get(step, {})
-                step_task = step_info.get("task", step)
-                step_model = step_info.get("model", "unknown")
-                step_output = step_info.get("output", "No output available").replace('\n', '<br>')
+            append('    <h2>Step Outputs</h2>\n')
+            for step, step_task, step_model, step_info in details:
+                step_output = step_info.get("output", "No output available").translate(_HTML_ESC_TABLE)
                 
-                output += f'    <div class="step-output">\n'
-                output += f'        <h3>{step}: {step_task}</h3>\n'
-                output += f'        <p><strong>Model</strong>: {step_model}</p>\n'
-                output += f'        <p><strong>Output</strong>:</p>\n'
-                output += f'        <div class="response">{step_output}</div>\n'
-                output += f'    </div>\n'
+                append('    <div class="step-output">\n')
+                append(f'        <h3>{_escape(step)}: {_escape(step_task)}</h3>\n')
+                append(f'        <p><strong>Model</strong>: {_escape(step_model)}</p>\n')
+                append('        <p><strong>Output</strong>:</p>\n')
+                append(f'        <div class="response">{step_output}</div>\n')
+                append('    </div>\n')
         else:
             # If there are no steps, just show the result
             # Add current step information if available
             if step_name and task:
-                output += f'    <div class="step">\n'
-                output += f'        <h2>Step: {step_name}</h2>\n'
-                output += f'        <p><strong>Task</strong>: {task}</p>\n'
-                output += '    </div>\n'
+                append('    <div class="step">\n')
+                append(f'        <h2>Step: {_escape(step_name)}</h2>\n')
+                append(f'        <p><strong>Task</strong>: {_escape(task)}</p>\n')
+                append('    </div>\n')
             
             # Add the main response
-            output += '    <h2>Result</h2>\n'
-            output += f'    <div class="response">{html_response}</div>\n'
+            append('    <h2>Result</h2>\n')
+            append(f'    <div class="response">{html_response}</div>\n')
         
-        output += f'    <p class="metadata">Generated by {model_info}</p>\n'
-        output += '</body>\n'
-        output += '</html>'
+        append(_HTML_SINGLE_FOOTER.format_map({'model': _escape(str(model_info))}))
     else:
         # Default to simple text
-        output = response_text
+        parts = [response_text]
         
-    logger.info(f"Output formatted for display ({format_type})")
-    return output
+    logger.info("Output formatted for display (%s)", format_type)
+    return parts
 
-def format_directory_results(response: Dict[str, Any], format_type: str = "markdown") -> str:
+def format_for_display(response: Dict[str, Any], format_type: str = "text") -> str:
     """
-    Format the results from processing multiple files in a directory.
+    Format the response for display in the specified format.
     
     Args:
-        response: The response containing results from processing files
+        response: The response from the AI model
         format_type: The format to use (text, markdown, json, html)
         
     Returns:
         The formatted output as a string
     """
+    return ''.join(_iter_for_display(response, format_type))
+
+def _iter_directory_results(response: Dict[str, Any], format_type: str = "markdown") -> Iterator[str]:
+    """
+    Format the results from processing multiple files in a directory as a stream of chunks.
+    
+    Args:
+        response: The response containing results from processing files
+        format_type: The format to use (text, markdown, json, html)
+        
+    Yields:
+        The formatted output, one header or file block at a time
+    """
     results = response.get("results", [])
     if not results:
-        return "No results available."
+        yield "No results available."
+        return
     
     # Count successful and failed files
-    successful = response.get("metadata", {}).get("successful_files", 0)
-    failed = response.get("metadata", {}).get("failed_files", 0)
+    metadata = response.get("metadata", {})
+    successful = metadata.get("successful_files", 0)
+    failed = metadata.get("failed_files", 0)
     directory_path = response.get("directory_path", "unknown")
     model = response.get("model", "unknown")
+    file_count = len(results)
+    summary = {
+        'directory_path': directory_path,
+        'file_count': file_count,
+        'successful': successful,
+        'failed': failed,
+        'model': model,
+    }
+    
+    # Bind hot lookups to locals for the per-file loops
+    basename = _basename
     
     if format_type == "text":
         # Simple text format
-        output = f"Directory Processing Results\n"
-        output += f"Directory: {directory_path}\n"
-        output += f"Files Processed: {len(results)}\n"
-        output += f"Successful: {successful}\n"
-        output += f"Failed: {failed}\n"
-        output += f"Model: {model}\n\n"
+        yield _TEXT_DIR_HEADER.format_map(summary)
         
         # Add each file result
         for i, file_result in enumerate(results, 1):
-            file_path = file_result.get("file_path", "Unknown file")
-            output += f"{i}. {os.path.basename(file_path)}\n"
-            output += f"Path: {file_path}\n"
+            get = file_result.get
+            file_path = get("file_path", "Unknown file")
+            error = get("error")
+            block = f"{i}. {basename(file_path)}\nPath: {file_path}\n"
             
-            if "error" in file_result:
-                output += f"Error: {file_result['error']}\n\n"
+            if error is not None:
+                yield block + f"Error: {error}\n\n"
             else:
-                output += f"Result: {file_result.get('text', '')}\n\n"
+                yield block + f"Result: {get('text', '')}\n\n"
                 
     elif format_type == "markdown":
         # Create a markdown report
-        output = f"# Directory Processing Results\n\n"
-        output += f"**Directory:** {directory_path}\n"
-        output += f"**Files Processed:** {len(results)}\n"
-        output += f"**Successful:** {successful}\n"
-        output += f"**Failed:** {failed}\n"
-        output += f"**Model:** {model}\n\n"
+        yield _MD_DIR_HEADER.format_map(summary)
         
         # Add each file result
         for i, file_result in enumerate(results, 1):
-            file_path = file_result.get("file_path", "Unknown file")
-            output += f"## {i}. {os.path.basename(file_path)}\n\n"
-            output += f"**Path:** {file_path}\n\n"
+            get = file_result.get
+            file_path = get("file_path", "Unknown file")
+            error = get("error")
+            block = f"## {i}. {basename(file_path)}\n\n**Path:** {file_path}\n\n"
             
-            if "error" in file_result:
-                output += f"**Error:** {file_result['error']}\n\n"
+            if error is not None:
+                yield block + f"**Error:** {error}\n\n---\n\n"
             else:
-                output += f"**Result:**\n\n{file_result.get('text', '')}\n\n"
-                
-            output += "---\n\n"
+                yield block + f"**Result:**\n\n{get('text', '')}\n\n---\n\n"
             
     elif format_type == "json":
         # JSON format
-        output = json.dumps(response, indent=2)
+        yield json.dumps(response, indent=2, separators=(',', ': '), ensure_ascii=False)
         
     elif format_type == "html":
-        # HTML format
-        output = '<!DOCTYPE html>\n'
-        output += '<html>\n'
-        output += '<head>\n'
-        output += '    <title>Directory Processing Results</title>\n'
-        output += '    <style>\n'
-        output += '        body { font-family: Arial, sans-serif; margin: 20px; }\n'
-        output += '        h1, h2 { color: #333; }\n'
-        output += '        .summary { padding: 10px; background-color: #f0f0f0; border-radius: 5px; margin-bottom: 20px; }\n'
-        output += '        .file-result { padding: 10px; background-color: #f9f9f9; border-radius: 5px; margin-bottom: 15px; }\n'
-        output += '        .file-path { color: #666; font-style: italic; }\n'
-        output += '        .error { color: #cc0000; }\n'
-        output += '    </style>\n'
-        output += '</head>\n'
-        output += '<body>\n'
-        output += '    <h1>Directory Processing Results</h1>\n'
-        output += '    <div class="summary">\n'
-        output += f'        <p><strong>Directory:</strong> {directory_path}</p>\n'
-        output += f'        <p><strong>Files Processed:</strong> {len(results)}</p>\n'
-        output += f'        <p><strong>Successful:</strong> {successful}</p>\n'
-        output += f'        <p><strong>Failed:</strong> {failed}</p>\n'
-        output += f'        <p><strong>Model:</strong> {model}</p>\n'
-        output += '    </div>\n'
+        # HTML format - escape dynamic fields and convert line breaks in one pass
+        yield _HTML_DIR_HEADER
+        yield _HTML_DIR_SUMMARY.format_map({
+            'directory_path': _escape(str(directory_path)),
+            'file_count': file_count,
+            'successful': successful,
+            'failed': failed,
+            'model': _escape(str(model)),
+        })
         
         # Add each file result
+        escape = _escape
         for i, file_result in enumerate(results, 1):
-            file_path = file_result.get("file_path", "Unknown file")
-            output += '    <div class="file-result">\n'
-            output += f'        <h2>{i}. {os.path.basename(file_path)}</h2>\n'
-            output += f'        <p class="file-path">Path: {file_path}</p>\n'
+            get = file_result.get
+            file_path = get("file_path", "Unknown file")
+            error = get("error")
+            block = ('    <div class="file-result">\n'
+                     f'        <h2>{i}. {escape(basename(file_path))}</h2>\n'
+                     f'        <p class="file-path">Path: {escape(file_path)}</p>\n')
             
-            if "error" in file_result:
-                output += f'        <p class="error">Error: {file_result["error"]}</p>\n'
+            if error is not None:
+                block += f'        <p class="error">Error: {escape(str(error))}</p>\n'
             else:
-                output += '        <p><strong>Result:</strong></p>\n'
-                result_text = file_result.get('text', '').replace('\n', '<br>')
-                output += f'        <div>{result_text}</div>\n'
+                result_text = get('text', '').translate(_HTML_ESC_TABLE)
+                block += f'        <p><strong>Result:</strong></p>\n        <div>{result_text}</div>\n'
                 
-            output += '    </div>\n'
+            yield block + '    </div>\n'
             
-        output += '</body>\n'
-        output += '</html>'
+        yield _HTML_DIR_FOOTER
     else:
         # Default to simple text
-        output = f"Directory Processing Results\n"
-        output += f"Files Processed: {len(results)}\n"
-        output += f"Successful: {successful}\n"
-        output += f"Failed: {failed}\n\n"
+        yield (f"Directory Processing Results\n"
+               f"Files Processed: {file_count}\n"
+               f"Successful: {successful}\n"
+               f"Failed: {failed}\n\n")
         
-    logger.info(f"Directory results formatted for display ({format_type})")
-    return output
+    logger.info("Directory results formatted for display (%s)", format_type)
+
+def format_directory_results(response: Dict[str, Any], format_type: str = "markdown") -> str:
+    """
+    Format the results from processing multiple files in a directory.
+    
+    Args:
+        response: The response containing results from processing files
+        format_type: The format to use (text, markdown, json, html)
+        
+    Returns:
+        The formatted output as a string
+    """
+    return ''.join(_iter_directory_results(response, format_type))
 
 def save_results_to_file(response: Dict[str, Any], output_file: str, 
                         format_type: str = "markdown") -> bool:
@@ -371,35 +557,33 @@ def save_results_to_file(response: Dict[str, Any], output_file: str,
         True if successful, False otherwise
     """
     try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+        # Create directory if it doesn't exist, once per directory
+        output_dir = os.path.dirname(os.path.abspath(output_file))
+        if output_dir not in _ensured_dirs:
+            if output_dir != os.getcwd():
+                os.makedirs(output_dir, exist_ok=True)
+            _ensured_dirs.add(output_dir)
         
-        # Check if this is a directory result with multiple files
-        if "results" in response:
-            if format_type == "json":
-                # Save as JSON
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(response, f, indent=2)
+        if format_type == "json":
+            # Save as JSON
+            if orjson is not None:
+                with open(output_file, 'wb') as f:
+                    f.write(orjson.dumps(response, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
             else:
-                # Format and save as text or markdown
-                formatted = format_directory_results(response, format_type)
                 with open(output_file, 'w', encoding='utf-8') as f:
-                    f.write(formatted)
+                    json.dump(response, f, indent=2, separators=(',', ': '), ensure_ascii=False)
         else:
-            # Single result
-            if format_type == "json":
-                # Save as JSON
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(response, f, indent=2)
+            # Stream the formatted chunks straight to the file
+            if "results" in response:
+                chunks = _iter_directory_results(response, format_type)
             else:
-                # Format and save as text or markdown
-                formatted = format_for_display(response, format_type)
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    f.write(formatted)
+                chunks = _iter_for_display(response, format_type)
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.writelines(chunks)
                     
-        logger.info(f"Results saved to {output_file}")
+        logger.info("Results saved to %s", output_file)
         return True
         
     except Exception as e:
-        logger.error(f"Error saving results to file: {str(e)}")
+        logger.error("Error saving results to file: %s", e)
         return False 
\ No newline at end of file
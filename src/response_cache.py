@@ -0,0 +1,162 @@
+"""
+Response Cache Module
+
+This module provides an exact-match SQLite cache for AI model responses, so
+repeated deterministic prompts can be answered without calling the API.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default location of the cache database, overridable with FLOOP_CACHE_PATH
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".floop", "response_cache.sqlite3")
+
+# Shared cache instance, created on first use
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+def make_cache_key(model: str, max_tokens: int, temperature: float, input_content: str) -> str:
+    """
+    Build the cache key for a model request.
+
+    The input is hashed exactly, except that \r\n and \r line endings and
+    trailing whitespace at the end of the input are normalized. Spacing,
+    indentation and line breaks inside the prompt can change the answer, so
+    prompts that differ in them get separate entries.
+
+    Args:
+        model: The AI model used
+        max_tokens: Maximum number of tokens in the response
+        temperature: Controls randomness (0-1)
+        input_content: The text content sent to the model
+
+    Returns:
+        A hex digest identifying the request
+    """
+    normalized = input_content
+    if '\r' in normalized:
+        normalized = normalized.replace('\r\n', '\n').replace('\r', '\n')
+    normalized = normalized.rstrip()
+    return hashlib.blake2b(
+        f"{model}|{max_tokens}|{temperature}|{normalized}".encode("utf-8"),
+        digest_size=16
+    ).hexdigest()
+
+def make_workflow_cache_key(model: str, format_type: str, input_text: str) -> str:
+    """
+    Build the cache key for a complete workflow run on text input.
+
+    Workflow keys are kept apart from single request keys, and the input is
+    normalized the same way as in make_cache_key.
+
+    Args:
+        model: The AI model or workflow used
+        format_type: The output format
+        input_text: The text input of the workflow
+
+    Returns:
+        A hex digest identifying the workflow run
+    """
+    return make_cache_key(f"workflow:{model}:{format_type}", 0, 0, input_text)
+
+class ResponseCache:
+    """
+    Exact-match response cache backed by a SQLite database.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        """
+        Open (and create if needed) the cache database.
+
+        Args:
+            path: Path to the SQLite database file
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response_json TEXT NOT NULL, ts INTEGER NOT NULL)"
+            )
+
+    def lookup(self, key: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: The cache key, as returned by make_cache_key
+            max_age: Ignore entries stored more than this many seconds ago
+                (default: None, entries do not expire)
+
+        Returns:
+            The cached response, or None if there is no current entry or the lookup failed
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT response_json, ts FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+            if row is None or (max_age is not None and time.time() - row[1] > max_age):
+                return None
+            return json.loads(row[0])
+        except Exception as e:
+            logger.warning("Error reading response cache: %s", e)
+            return None
+
+    def update(self, key: str, response: Dict[str, Any]) -> None:
+        """
+        Store a response in the cache, replacing any existing entry.
+
+        Args:
+            key: The cache key, as returned by make_cache_key
+            response: The response to store
+        """
+        try:
+            response_json = json.dumps(response, ensure_ascii=False)
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response_json, ts) VALUES (?, ?, ?)",
+                    (key, response_json, int(time.time()))
+                )
+        except Exception as e:
+            logger.warning("Error writing response cache: %s", e)
+
+    def close(self) -> None:
+        """Close the cache database."""
+        with self._lock:
+            self._conn.close()
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Get the shared response cache if caching is enabled.
+
+    Caching is enabled by setting the FLOOP_CACHE environment variable to 1.
+
+    Returns:
+        The shared ResponseCache, or None if caching is disabled or unavailable
+    """
+    global _response_cache
+
+    if os.getenv("FLOOP_CACHE") != "1":
+        return None
+
+    with _response_cache_lock:
+        if _response_cache is None:
+            try:
+                _response_cache = ResponseCache(os.getenv("FLOOP_CACHE_PATH", DEFAULT_CACHE_PATH))
+            except Exception as e:
+                logger.warning("Response cache unavailable: %s", e)
+                return None
+        return _response_cache
@@ -11,18 +11,22 @@ from typing import Dict, List, Optional, Union, Any
 import openai
 from dotenv import load_dotenv
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+try:
+    from src.client_utils import TEMP_ERR_RE, make_http_client
+except ModuleNotFoundError:
+    from client_utils import TEMP_ERR_RE, make_http_client
+
+# Logging is configured by the entry point that runs the workflow
 logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
+# Shared connection pool so consecutive searches reuse warm connections
+_http = make_http_client(max_keepalive_connections=20, max_connections=40)
+
 # Initialize the OpenAI client
-client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=_http)
 
 def call_web_search(
     query: Union[str, Dict[str, Any]],
@@ -56,7 +60,7 @@ def call_web_search(
     
     while retry_count <= max_retries:
         try:
-            logger.info(f"Performing web search for query: {search_query}")
+            logger.info("Performing web search for query: %s", search_query)
             
             # Use OpenAI's GPT model with web search capability
             response = client.chat.completions.create(
@@ -89,19 +93,17 @@ def call_web_search(
             error_message = str(e)
             
             # Check if the error is temporary (e.g., rate limit, timeout)
-            is_temporary_error = any(
-                error_type in error_message.lower()
-                for error_type in ["timeout", "rate limit", "server error", "503", "429"]
-            )
+            is_temporary_error = TEMP_ERR_RE.search(error_message) is not None
             
             if is_temporary_error and retry_count <= max_retries:
                 # Calculate exponential backoff delay
                 delay = retry_delay * (2 ** (retry_count - 1))
-                logger.warning(f"Temporary error: {error_message}. Retrying in {delay:.2f} seconds (attempt {retry_count}/{max_retries})...")
+                logger.warning("Temporary error: %s. Retrying in %.2f seconds (attempt %d/%d)...",
+                               error_message, delay, retry_count, max_retries)
                 time.sleep(delay)
             else:
                 # Permanent error or max retries reached
-                logger.error(f"Error calling web search API: {error_message}")
+                logger.error("Error calling web search API: %s", error_message)
                 return {
                     "error": error_message,
                     "text": f"Error performing web search: {error_message}"
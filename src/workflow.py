@@ -9,7 +9,10 @@ import os
 import sys
 import logging
 import json
-from typing import Dict, Any, Optional, Literal, List
+import asyncio
+import functools
+import importlib
+from typing import Dict, Any, Optional, Literal, List, Callable, Tuple
 import click
 from dotenv import load_dotenv
 
@@ -19,86 +22,178 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 # Import from src package
 try:
     # Try importing as a module first
+    from src.directory_fanout import DEFAULT_MAX_CONCURRENCY
     from src.input_handler import process_input
-    from src.chatgpt_client import call_chatgpt
-    from src.claude_client import call_claude
-    from src.web_search_client import call_web_search
+    from src.response_cache import get_response_cache, make_cache_key, make_workflow_cache_key
     from src.output_formatter import format_output, format_for_display, save_results_to_file
 except ModuleNotFoundError:
     # If that fails, import directly
+    from directory_fanout import DEFAULT_MAX_CONCURRENCY
     from input_handler import process_input
-    from chatgpt_client import call_chatgpt
-    from claude_client import call_claude
-    from web_search_client import call_web_search
+    from response_cache import get_response_cache, make_cache_key, make_workflow_cache_key
     from output_formatter import format_output, format_for_display, save_results_to_file
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Logging is configured by the entry point that runs the workflow
 logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
-def process_single_input(
+# Click option choices, built once at import
+_STRATEGY_CHOICES = click.Choice(('individual', 'concatenate'))
+_MODEL_CHOICES = click.Choice(('chatgpt', 'claude', 'web_search'))
+_FORMAT_CHOICES = click.Choice(('text', 'json', 'markdown', 'html'))
+
+# Client module and function for each provider. The provider SDKs are slow to
+# import, so each client is only imported when its model is first used.
+_CALLERS = {
+    "chatgpt": ("chatgpt_client", "call_chatgpt"),
+    "claude": ("claude_client", "call_claude"),
+    "web_search": ("web_search_client", "call_web_search"),
+    "chatgpt_batch": ("chatgpt_client", "call_chatgpt_batch"),
+    "claude_batch": ("claude_client", "call_claude_batch"),
+}
+
+# Caller used for each model when a directory is processed as a batch job
+_BATCH_CALLERS = {
+    "chatgpt": "chatgpt_batch",
+    "claude": "claude_batch",
+}
+
+@functools.lru_cache(maxsize=None)
+def _get_caller(model: str) -> Callable[..., Dict[str, Any]]:
+    """
+    Import the client for a provider and return its call function.
+    
+    Args:
+        model: The caller name, a key of _CALLERS
+        
+    Returns:
+        The function that sends a request to the provider
+    """
+    module_name, function_name = _CALLERS[model]
+    try:
+        module = importlib.import_module(f"src.{module_name}")
+    except ModuleNotFoundError:
+        module = importlib.import_module(module_name)
+    return getattr(module, function_name)
+
+@functools.lru_cache(maxsize=1)
+def _get_config_workflow() -> Tuple[Callable[..., Any], Callable[..., Dict[str, Any]]]:
+    """
+    Import the configurable workflow on first use and return its entry points.
+    
+    The import is deferred to avoid a circular import with config_workflow.
+    
+    Returns:
+        The load_config and run_configurable_workflow functions
+    """
+    try:
+        from src.config_workflow import load_config, run_configurable_workflow
+    except ModuleNotFoundError:
+        from config_workflow import load_config, run_configurable_workflow
+    return load_config, run_configurable_workflow
+
+# Models answered by a single provider call, with their log label and whether
+# the client accepts the sampling and concurrency options
+_DISPATCH = {
+    "chatgpt": ("ChatGPT", True),
+    "claude": ("Claude", True),
+    "web_search": ("web search", False),
+}
+
+# Maximum age of a workflow result reused by cached_run_workflow, in seconds
+DEFAULT_WORKFLOW_CACHE_TTL = 24 * 60 * 60
+
+def _call_model(
     input_content: str,
-    model: Literal["chatgpt", "claude", "claude-first", "web_search"] = "chatgpt",
-    max_tokens: int = 1000,
-    temperature: float = 0.7,
-    source_info: Dict[str, Any] = None
+    model: str,
+    max_tokens: int,
+    temperature: float
 ) -> Dict[str, Any]:
     """
-    Process a single input with the selected AI model.
+    Send an input to the selected AI model or multi-step workflow.
     
     Args:
         input_content: The text content to process
         model: The AI model to use
         max_tokens: Maximum number of tokens in the response
         temperature: Controls randomness (0-1)
-        source_info: Information about the source of the input
         
     Returns:
-        Dictionary containing the result and metadata
+        The model response, containing an "error" key if the request failed
     """
-    # Run the workflow based on the selected model
-    if model == "chatgpt":
-        logger.info("Running workflow with ChatGPT...")
-        response = call_chatgpt(input_content, max_tokens=max_tokens, temperature=temperature)
-    elif model == "claude":
-        logger.info("Running workflow with Claude...")
-        response = call_claude(input_content, max_tokens=max_tokens, temperature=temperature)
-    elif model == "web_search":
-        logger.info("Running workflow with web search...")
-        response = call_web_search(input_content)
-    elif model == "claude-first":
+    dispatch = _DISPATCH.get(model)
+    if dispatch is not None:
+        label, takes_options = dispatch
+        logger.info("Running workflow with %s...", label)
+        call = _get_caller(model)
+        if takes_options:
+            return call(input_content, max_tokens=max_tokens, temperature=temperature)
+        return call(input_content)
+    
+    if model == "claude-first":
         logger.info("Running multi-step workflow (Claude -> ChatGPT)...")
         
         # First, call Claude
         logger.info("Step 1: Calling Claude...")
-        claude_response = call_claude(input_content, max_tokens=max_tokens, temperature=temperature)
+        claude_response = _get_caller("claude")(input_content, max_tokens=max_tokens, temperature=temperature)
         
-        if "error" in claude_response:
-            logger.error(f"Claude error: {claude_response['error']}")
-            return {"error": claude_response["error"], "result": None}
+        if claude_response.get("error") is not None:
+            return claude_response
         
         # Then, use Claude's response as input for ChatGPT
         logger.info("Step 2: Calling ChatGPT with Claude's response...")
         chatgpt_prompt = f"Here's an analysis from another AI assistant: {claude_response['text']}\n\nPlease review and refine this analysis."
-        response = call_chatgpt(chatgpt_prompt, max_tokens=max_tokens, temperature=temperature)
+        response = _get_caller("chatgpt")(chatgpt_prompt, max_tokens=max_tokens, temperature=temperature)
         
-        # Add Claude's response to the result
-        if "error" not in response:
-            response["claude_response"] = claude_response["text"]
-    else:
-        logger.error(f"Invalid model: {model}")
-        return {"error": f"Invalid model: {model}", "result": None}
+        # Add Claude's response to the result (error responses are returned without it)
+        response["claude_response"] = claude_response["text"]
+        return response
     
-    # Check for errors
-    if "error" in response:
-        logger.error(f"Model error: {response['error']}")
-        return {"error": response["error"], "result": None}
+    return {"error": f"Invalid model: {model}"}
+
+def process_single_input(
+    input_content: str,
+    model: Literal["chatgpt", "claude", "claude-first", "web_search"] = "chatgpt",
+    max_tokens: int = 1000,
+    temperature: float = 0.7,
+    source_info: Dict[str, Any] = None
+) -> Dict[str, Any]:
+    """
+    Process a single input with the selected AI model.
+    
+    Args:
+        input_content: The text content to process
+        model: The AI model to use
+        max_tokens: Maximum number of tokens in the response
+        temperature: Controls randomness (0-1)
+        source_info: Information about the source of the input
+        
+    Returns:
+        Dictionary containing the result and metadata
+    """
+    # Deterministic requests can be answered from the response cache (FLOOP_CACHE=1).
+    # Only the model response is cached; the source info is added per call.
+    cache = get_response_cache() if temperature == 0 else None
+    response = None
+    if cache is not None:
+        cache_key = make_cache_key(model, max_tokens, temperature, input_content)
+        response = cache.lookup(cache_key)
+        
+    if response is not None:
+        logger.info("Using cached response for model: %s", model)
+    else:
+        response = _call_model(input_content, model, max_tokens, temperature)
+        
+        # Check for errors
+        error = response.get("error")
+        if error is not None:
+            logger.error("Model error: %s", error)
+            return {"error": error, "result": None}
+            
+        if cache is not None:
+            cache.update(cache_key, response)
     
     # Return the result
     result = {
@@ -131,7 +226,9 @@ def run_workflow(
     model: str = "chatgpt",
     output_file: Optional[str] = None,
     format_type: str = "text",
-    web_search: Optional[str] = None
+    web_search: Optional[str] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    batch: bool = False
 ) -> Dict[str, Any]:
     """
     Run the AI workflow.
@@ -147,35 +244,46 @@ def run_workflow(
         output_file: Path to output file
         format_type: Output format
         web_search: Web search query (overrides other input methods)
+        max_concurrency: Maximum number of directory files sent to the model at once
+        batch: Whether to process individual directory files as a discounted
+            batch job, which can take up to 24 hours
         
     Returns:
         Dictionary containing the workflow result and metadata
     """
-    logger = logging.getLogger(__name__)
-    
     # Check if web search is provided
     if web_search:
-        logger.info(f"Using web search query: {web_search}")
+        logger.info("Using web search query: %s", web_search)
         input_result = {"text": web_search, "source": "web_search_query"}
         model = "web_search"
     else:
-        # Process input
+        # Process input. Individual directory files are read as the model
+        # works through them, except for batch jobs which upload them all.
         input_result = process_input(input_text, input_file, input_directory, 
-                                   file_pattern, recursive, processing_strategy)
+                                   file_pattern, recursive, processing_strategy,
+                                   lazy=not batch)
     
     if "error" in input_result:
         return input_result
     
     # Call AI model
-    if model == "chatgpt":
-        model_result = call_chatgpt(input_result)
-    elif model == "claude":
-        model_result = call_claude(input_result)
-    elif model == "web_search":
-        model_result = call_web_search(input_result)
-    else:
+    dispatch = _DISPATCH.get(model)
+    if dispatch is None:
         return {"error": f"Invalid model: {model}"}
     
+    batch_caller = None
+    if batch and input_result.get("source") == "directory" and input_result.get("processing_strategy") == "individual":
+        batch_caller = _BATCH_CALLERS.get(model)
+        if batch_caller is None:
+            logger.warning("Batch processing is not available for %s, sending requests directly", model)
+    
+    if batch_caller is not None:
+        model_result = _get_caller(batch_caller)(input_result)
+    elif dispatch[1]:
+        model_result = _get_caller(model)(input_result, max_concurrency=max_concurrency)
+    else:
+        model_result = _get_caller(model)(input_result)
+    
     if "error" in model_result:
         return model_result
     
@@ -189,14 +297,14 @@ def run_workflow(
             success = save_results_to_file(formatted_result, output_file, format_type)
             
             if success:
-                logger.info(f"Output saved to file: {output_file}")
+                logger.info("Output saved to file: %s", output_file)
                 # Return the formatted result directly
                 return formatted_result
             else:
                 logger.error("Failed to save output to file")
                 return {"error": "Failed to save output to file"}
         except Exception as e:
-            logger.error(f"Error saving output to file: {str(e)}")
+            logger.error("Error saving output to file: %s", e)
             return {"error": f"Error saving output to file: {str(e)}"}
     else:
         # Format for display
@@ -209,6 +317,111 @@ def run_workflow(
             "result": formatted_result
         }
 
+def run_workflow_batch(
+    inputs: List[str],
+    model: Literal["chatgpt", "claude"] = "chatgpt",
+    format_type: str = "text"
+) -> List[Dict[str, Any]]:
+    """
+    Run the AI workflow on several text inputs as one discounted batch job.
+    
+    All inputs are submitted to the provider's batch API in a single request.
+    The job may take up to 24 hours; this function waits for it to finish.
+    
+    Args:
+        inputs: Text inputs to process
+        model: AI model to use, one with batch support
+        format_type: Output format
+        
+    Returns:
+        One result per input, in the same order, each shaped like the console
+        result of run_workflow or containing an "error" key
+    """
+    batch_caller = _BATCH_CALLERS.get(model)
+    if batch_caller is None:
+        return [{"error": f"Batch processing is not available for {model}"} for _ in inputs]
+    
+    model_result = _get_caller(batch_caller)({"files": [{"content": text} for text in inputs]})
+    if "error" in model_result:
+        return [{"error": model_result["error"]} for _ in inputs]
+    
+    # Clean all responses in one pass, then split them back into per-input results
+    results = []
+    for formatted_result in format_output(model_result)["results"]:
+        error = formatted_result.get("error")
+        if error is not None:
+            results.append({"error": error})
+            continue
+            
+        formatted_result.pop("file_path", None)
+        results.append({
+            "output_type": "console",
+            "output": format_for_display(formatted_result, format_type),
+            "format": format_type,
+            "result": formatted_result
+        })
+    
+    return results
+
+def cached_run_workflow(
+    input_text: str,
+    model: Literal["chatgpt", "claude", "web_search"] = "chatgpt",
+    format_type: str = "text",
+    ttl: float = DEFAULT_WORKFLOW_CACHE_TTL
+) -> Dict[str, Any]:
+    """
+    Run the AI workflow on text input, reusing a recent result of an identical run.
+    
+    Results are only cached when the response cache is enabled (FLOOP_CACHE=1),
+    keyed by the model, the output format and the input (see make_cache_key).
+    Workflows sample at a non-zero temperature, so a stored result is only
+    reused for ttl seconds. Results with errors are not cached.
+    
+    Args:
+        input_text: Direct text input
+        model: AI model to use
+        format_type: Output format
+        ttl: Maximum age in seconds of a reused result (default: one day)
+        
+    Returns:
+        Dictionary containing the workflow result and metadata
+    """
+    cache = get_response_cache()
+    if cache is None:
+        return run_workflow(input_text=input_text, model=model, format_type=format_type)
+        
+    cache_key = make_workflow_cache_key(model, format_type, input_text)
+    cached = cache.lookup(cache_key, max_age=ttl)
+    if cached is not None:
+        logger.info("Using cached workflow result for model: %s", model)
+        return cached
+        
+    result = run_workflow(input_text=input_text, model=model, format_type=format_type)
+    if "error" not in result:
+        cache.update(cache_key, result)
+    return result
+
+async def arun_workflow(*args: Any, cached: bool = False, **kwargs: Any) -> Dict[str, Any]:
+    """
+    Run the AI workflow without blocking the event loop.
+    
+    Input processing, the model call and output handling depend on each
+    other, so they run in order on a worker thread. Independent workflows
+    can be run concurrently with asyncio.gather.
+    
+    Args:
+        *args: Positional arguments passed to run_workflow
+        cached: Run through cached_run_workflow, which only takes input_text,
+            model, format_type and ttl (default: False)
+        **kwargs: Keyword arguments passed to run_workflow
+        
+    Returns:
+        Dictionary containing the workflow result and metadata
+    """
+    workflow = cached_run_workflow if cached else run_workflow
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(workflow, *args, **kwargs))
+
 # CLI interface using Click
 @click.command()
 @click.option('--input', '-i', help='Direct text input')
@@ -216,44 +429,33 @@ def run_workflow(
 @click.option('--input_directory', '-d', help='Path to input directory')
 @click.option('--file_pattern', default='*.txt', help='File pattern for directory input (default: *.txt)')
 @click.option('--recursive', is_flag=True, help='Search recursively in subdirectories')
-@click.option('--processing_strategy', type=click.Choice(['individual', 'concatenate']), 
+@click.option('--processing_strategy', type=_STRATEGY_CHOICES, 
               default='individual', help='How to process directory files (default: individual)')
 @click.option('--output_file', '-o', help='Path to output file')
-@click.option('--model', '-m', type=click.Choice(['chatgpt', 'claude', 'web_search']), default='chatgpt',
+@click.option('--model', '-m', type=_MODEL_CHOICES, default='chatgpt',
               help='AI model to use (default: chatgpt)')
-@click.option('--format', '-fmt', type=click.Choice(['text', 'json', 'markdown', 'html']), 
+@click.option('--format', '-fmt', type=_FORMAT_CHOICES, 
               default='text', help='Output format (default: text)')
 @click.option('--config', '-c', help='Path to workflow configuration file')
 @click.option('--web_search', '-ws', help='Web search query (overrides other input methods)')
+@click.option('--max_concurrency', type=click.IntRange(min=1), default=DEFAULT_MAX_CONCURRENCY,
+              help=f'Maximum number of directory files processed at once (default: {DEFAULT_MAX_CONCURRENCY})')
+@click.option('--batch', is_flag=True, help='Process directory files as a discounted batch job (may take up to 24 hours)')
 def cli(input: Optional[str], input_file: Optional[str], input_directory: Optional[str],
         file_pattern: str, recursive: bool, processing_strategy: str,
         output_file: Optional[str], model: str, format: str, config: Optional[str],
-        web_search: Optional[str]):
+        web_search: Optional[str], max_concurrency: int, batch: bool):
     """Run the AI workflow from the command line."""
     try:
-        # Load environment variables
-        load_dotenv()
-        
-        # Configure logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        logger = logging.getLogger(__name__)
-        
         # Check if a configuration file is provided
         if config:
-            # Import config_workflow here to avoid circular imports
-            try:
-                from src.config_workflow import load_config, run_configurable_workflow
-            except ModuleNotFoundError:
-                from config_workflow import load_config, run_configurable_workflow
-                
-            logger.info(f"Loading workflow configuration from: {config}")
+            load_config, run_configurable_workflow = _get_config_workflow()
+            
+            logger.info("Loading workflow configuration from: %s", config)
             workflow_config = load_config(config)
             
             if "error" in workflow_config:
-                logger.error(f"Error loading configuration: {workflow_config['error']}")
+                logger.error("Error loading configuration: %s", workflow_config['error'])
                 sys.exit(1)
             
             # Run configurable workflow
@@ -281,12 +483,14 @@ def cli(input: Optional[str], input_file: Optional[str], input_directory: Option
                 model=model,
                 output_file=output_file,
                 format_type=format,
-                web_search=web_search
+                web_search=web_search,
+                max_concurrency=max_concurrency,
+                batch=batch
             )
         
         # Check for errors
         if "error" in result:
-            logger.error(f"Workflow error: {result['error']}")
+            logger.error("Workflow error: %s", result['error'])
             sys.exit(1)
         
         # Print output if not saved to file
@@ -296,9 +500,15 @@ def cli(input: Optional[str], input_file: Optional[str], input_directory: Option
         logger.info("Workflow completed successfully")
         
     except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}")
+        logger.error("Unexpected error: %s", e)
         sys.exit(1)
 
 if __name__ == "__main__":
+    # Configure logging once for command-line runs
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
     # Run the CLI if this file is executed directly
     cli() 
\ No newline at end of file
@@ -0,0 +1,159 @@
+"""
+Test script for batch clients.
+
+This script tests how the batch clients join batch output back to the source
+files, using fake API clients in place of the real ones, so no API key is needed.
+"""
+
+import json
+from types import SimpleNamespace
+
+import src.chatgpt_client
+import src.claude_client
+
+# Directory input with three files, as returned by process_input
+DIRECTORY_INPUT = {
+    "files": [
+        {"file_path": "a.txt", "content": "first"},
+        {"file_path": "b.txt", "content": "second"},
+        {"file_path": "c.txt", "content": "third"}
+    ],
+    "directory_path": "docs",
+    "processing_strategy": "individual"
+}
+
+class FakeOpenAIBatches:
+    """Batch job that only ever reaches the given status."""
+
+    def __init__(self, status):
+        self.status = status
+        self.cancelled = False
+
+    def create(self, **kwargs):
+        return SimpleNamespace(id="batch_1", status="in_progress", output_file_id=None, error_file_id=None)
+
+    def retrieve(self, batch_id):
+        return self._batch(self.status)
+
+    def cancel(self, batch_id):
+        self.cancelled = True
+        return self._batch("cancelling")
+
+    def _batch(self, status):
+        return SimpleNamespace(id="batch_1", status=status, output_file_id="out_1", error_file_id="err_1")
+
+class FakeOpenAIFiles:
+    """Output file with a response for file 0 and an error file entry for file 1."""
+
+    def create(self, **kwargs):
+        return SimpleNamespace(id="in_1")
+
+    def content(self, file_id):
+        if file_id == "out_1":
+            line = {"custom_id": "0", "response": {"status_code": 200, "body": {
+                "choices": [{"message": {"content": "summary"}}],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 2, "total_tokens": 3}
+            }}}
+        else:
+            line = {"custom_id": "1", "response": {"status_code": 429, "body": {
+                "error": {"message": "rate limit reached"}
+            }}}
+        return SimpleNamespace(text=json.dumps(line) + "\n")
+
+def _run_chatgpt_batch(status, timeout):
+    """Run call_chatgpt_batch against a fake client and return its result and batches."""
+    original_client = src.chatgpt_client.client
+    batches = FakeOpenAIBatches(status)
+    try:
+        src.chatgpt_client.client = SimpleNamespace(batches=batches, files=FakeOpenAIFiles())
+        result = src.chatgpt_client.call_chatgpt_batch(DIRECTORY_INPUT, poll_interval=0, timeout=timeout)
+    finally:
+        src.chatgpt_client.client = original_client
+    return result, batches
+
+def test_chatgpt_batch_expired():
+    """Test that an expired batch still reports the requests that finished."""
+    result, batches = _run_chatgpt_batch("expired", timeout=60)
+    first, second, third = result["results"]
+    assert first["text"] == "summary" and first["file_path"] == "a.txt"
+    assert second["error"] == "rate limit reached" and second["file_path"] == "b.txt"
+    assert third["error"] == "Batch batch_1 ended with status: expired"
+    assert result["metadata"] == {"successful_files": 1, "failed_files": 2}
+    assert not batches.cancelled
+
+def test_chatgpt_batch_timeout():
+    """Test that a batch still running at the timeout is cancelled."""
+    result, batches = _run_chatgpt_batch("in_progress", timeout=0)
+    assert batches.cancelled
+    assert result["results"][0]["text"] == "summary"
+    assert result["results"][2]["error"] == "Batch batch_1 did not finish in time (status: in_progress)"
+
+class FakeMessageBatches:
+    """Message batch with a reply, a reply without text and an expired request."""
+
+    def __init__(self, status):
+        self.status = status
+        self.cancelled = False
+
+    def create(self, requests):
+        return SimpleNamespace(id="msgbatch_1", processing_status="in_progress")
+
+    def retrieve(self, batch_id):
+        return SimpleNamespace(id=batch_id, processing_status=self.status)
+
+    def cancel(self, batch_id):
+        self.cancelled = True
+        return SimpleNamespace(id=batch_id, processing_status="canceling")
+
+    def results(self, batch_id):
+        usage = SimpleNamespace(input_tokens=1, output_tokens=2)
+        return [
+            SimpleNamespace(custom_id="0", result=SimpleNamespace(
+                type="succeeded",
+                message=SimpleNamespace(content=[SimpleNamespace(text="summary")], usage=usage)
+            )),
+            SimpleNamespace(custom_id="1", result=SimpleNamespace(
+                type="succeeded",
+                message=SimpleNamespace(content=[], usage=usage)
+            )),
+            SimpleNamespace(custom_id="2", result=SimpleNamespace(type="expired"))
+        ]
+
+def _run_claude_batch(status, timeout):
+    """Run call_claude_batch against a fake client and return its result and batches."""
+    original_client = src.claude_client.client
+    batches = FakeMessageBatches(status)
+    try:
+        src.claude_client.client = SimpleNamespace(messages=SimpleNamespace(batches=batches))
+        result = src.claude_client.call_claude_batch(DIRECTORY_INPUT, poll_interval=0, timeout=timeout)
+    finally:
+        src.claude_client.client = original_client
+    return result, batches
+
+def test_claude_batch_ended():
+    """Test that an unreadable message fails only its own file."""
+    result, batches = _run_claude_batch("ended", timeout=60)
+    first, second, third = result["results"]
+    assert first["text"] == "summary" and first["file_path"] == "a.txt"
+    assert second["error"].startswith("Error reading message batch result") and second["file_path"] == "b.txt"
+    assert third["error"] == "Request expired"
+    assert result["metadata"] == {"successful_files": 1, "failed_files": 2}
+    assert not batches.cancelled
+
+def test_claude_batch_timeout():
+    """Test that a message batch still running at the timeout is cancelled."""
+    result, batches = _run_claude_batch("in_progress", timeout=0)
+    assert batches.cancelled
+    assert result["error"] == "Message batch msgbatch_1 did not finish in time (status: in_progress)"
+
+def main():
+    """Main function to test the batch clients."""
+    print("Testing batch clients...")
+    test_chatgpt_batch_expired()
+    test_chatgpt_batch_timeout()
+    test_claude_batch_ended()
+    test_claude_batch_timeout()
+    print("\n✅ Batch clients joined the results correctly!")
+
+if __name__ == "__main__":
+    main()
@@ -4,37 +4,13 @@ Test script for loading workflow configuration.
 This script tests loading and parsing a workflow configuration file.
 """
 
-import json
-import os
+import logging
 import sys
 
-def load_config(config_path):
-    """
-    Load a workflow configuration from a JSON file.
-    
-    Args:
-        config_path: Path to the configuration file
-        
-    Returns:
-        The parsed configuration as a dictionary
-    """
-    try:
-        if not os.path.exists(config_path):
-            print(f"Error: Configuration file not found: {config_path}")
-            return None
-            
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-            
-        print(f"Successfully loaded configuration from: {config_path}")
-        return config
-        
-    except json.JSONDecodeError as e:
-        print(f"Error: Invalid JSON in configuration file: {str(e)}")
-        return None
-    except Exception as e:
-        print(f"Error loading configuration: {str(e)}")
-        return None
+from src.config_loader import load_config
+
+# Show the loader's messages on the console
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 
 def main():
     """Main function to test loading a workflow configuration."""
@@ -60,10 +36,12 @@ def main():
             print(f"Path: {input_config.get('path')}")
         
         print("\nSteps:")
-        for i, step in enumerate(config.get('steps', [])):
-            print(f"Step {i+1}: {step.get('name')}")
-            print(f"  Model: {step.get('model')}")
-            print(f"  Prompt template: {step.get('prompt_template')}")
+        sys.stdout.write("".join(
+            f"Step {i+1}: {step.get('name')}\n"
+            f"  Model: {step.get('model')}\n"
+            f"  Prompt template: {step.get('prompt_template')}\n"
+            for i, step in enumerate(config.get('steps', []))
+        ))
         
         print("\nOutput:")
         output_config = config.get('output', {})
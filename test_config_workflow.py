@@ -4,58 +4,28 @@ Test script for configurable workflow.
 This script tests the configurable workflow module by running a workflow with a configuration file.
 """
 
-import sys
-import click
+import argparse
 from src.config_workflow import run_workflow
 
 def main():
     """Main function to test the configurable workflow."""
-    # Get configuration file path from command line arguments
-    if len(sys.argv) > 1:
-        config_path = sys.argv[1]
-    else:
-        config_path = "configs/workflow_config.json"
-    
-    # Get optional CLI arguments
-    input_text = None
-    input_file = None
-    output_file = None
-    format_type = "text"
-    legacy_mode = False
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="Test the configurable workflow.")
+    parser.add_argument("config", nargs="?", default="configs/workflow_config.json",
+                        help="Path to workflow configuration file")
+    parser.add_argument("--input", "-i", help="Direct text input")
+    parser.add_argument("--input_file", "-f", help="Path to input file")
+    parser.add_argument("--output_file", "-o", help="Path to output file")
+    parser.add_argument("--format", default="text", help="Output format")
+    parser.add_argument("--legacy-mode", action="store_true", help="Run in legacy mode")
+    args = parser.parse_args()
     
-    # Parse additional command line arguments
-    i = 2
-    while i < len(sys.argv):
-        arg = sys.argv[i]
-        if arg == "--input" or arg == "-i":
-            if i + 1 < len(sys.argv):
-                input_text = sys.argv[i + 1]
-                i += 2
-            else:
-                i += 1
-        elif arg == "--input_file" or arg == "-f":
-            if i + 1 < len(sys.argv):
-                input_file = sys.argv[i + 1]
-                i += 2
-            else:
-                i += 1
-        elif arg == "--output_file" or arg == "-o":
-            if i + 1 < len(sys.argv):
-                output_file = sys.argv[i + 1]
-                i += 2
-            else:
-                i += 1
-        elif arg == "--format":
-            if i + 1 < len(sys.argv):
-                format_type = sys.argv[i + 1]
-                i += 2
-            else:
-                i += 1
-        elif arg == "--legacy-mode":
-            legacy_mode = True
-            i += 1
-        else:
-            i += 1
+    config_path = args.config
+    input_text = args.input
+    input_file = args.input_file
+    output_file = args.output_file
+    format_type = args.format
+    legacy_mode = args.legacy_mode
     
     print(f"Testing configurable workflow with configuration: {config_path}")
     if input_text:
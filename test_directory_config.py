@@ -4,37 +4,12 @@ Test script for loading directory input configuration.
 This script tests loading and parsing a workflow configuration file with directory input.
 """
 
-import json
-import os
-import sys
+import logging
 
-def load_config(config_path):
-    """
-    Load a workflow configuration from a JSON file.
-    
-    Args:
-        config_path: Path to the configuration file
-        
-    Returns:
-        The parsed configuration as a dictionary
-    """
-    try:
-        if not os.path.exists(config_path):
-            print(f"Error: Configuration file not found: {config_path}")
-            return None
-            
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-            
-        print(f"Successfully loaded configuration from: {config_path}")
-        return config
-        
-    except json.JSONDecodeError as e:
-        print(f"Error: Invalid JSON in configuration file: {str(e)}")
-        return None
-    except Exception as e:
-        print(f"Error loading configuration: {str(e)}")
-        return None
+from src.config_loader import load_config
+
+# Show the loader's messages on the console
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 
 def main():
     """Main function to test loading a directory input configuration."""
@@ -32,8 +32,10 @@ def test_directory_input():
     print(f"Processing strategy: {result['processing_strategy']}")
     
     print("\nFiles found:")
-    for i, file_info in enumerate(result['files'], 1):
-        print(f"{i}. {file_info['file_path']} ({len(file_info['content'])} characters)")
+    sys.stdout.write("".join(
+        f"{i}. {file_info['file_path']} ({len(file_info['content'])} characters)\n"
+        for i, file_info in enumerate(result['files'], 1)
+    ))
     
     # Test with concatenated processing
     print("\n2. Testing directory input with concatenated processing:")
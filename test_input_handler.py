@@ -1,10 +1,32 @@
 """
 Test script for input handler.
 
-This script tests the input handler by reading from a file and printing the content.
+This script tests the input handler by reading from a file and printing the content,
+and by searching a directory tree that contains symlinks.
 """
 
-from src.input_handler import process_input
+import os
+import tempfile
+
+from src.input_handler import find_files_in_directory, process_input
+
+def test_find_files_follows_symlinks():
+    """Test that a recursive search follows symlinked directories but not symlink loops."""
+    with tempfile.TemporaryDirectory() as root:
+        os.mkdir(os.path.join(root, "sub"))
+        for name in ("a.txt", os.path.join("sub", "b.txt")):
+            with open(os.path.join(root, name), "w") as f:
+                f.write("text")
+        os.symlink(os.path.join(root, "sub"), os.path.join(root, "link"))
+        os.symlink(root, os.path.join(root, "sub", "up"))
+        
+        files = find_files_in_directory(root, "*.txt", recursive=True)
+        
+    assert [os.path.relpath(f, root) for f in files] == [
+        "a.txt",
+        os.path.join("link", "b.txt"),
+        os.path.join("sub", "b.txt")
+    ]
 
 def main():
     """Main function to test the input handler."""
@@ -23,6 +45,11 @@ def main():
         print(f"Source: {result['source']}")
         print(f"File: {result['file_path']}")
         print(f"Content: {result['text']}")
+    
+    # Test a directory tree with symlinks
+    print("\nSearching a directory tree with symlinks...")
+    test_find_files_follows_symlinks()
+    print("✅ Symlinked directories followed without looping!")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,26 +1,65 @@
 """
 Test script for workflow orchestrator.
 
-This script tests the workflow orchestrator by running a simple workflow with Claude.
+This script tests the workflow orchestrator by running simple workflows with Claude.
+The workflows run concurrently, so the test takes about as long as the slowest one,
+and with FLOOP_CACHE=1 recent results are reused from the response cache.
+
+The test functions can also be collected by pytest, so both inputs run in one
+interpreter session. They always call the API and are skipped when
+ANTHROPIC_API_KEY is not set.
 """
 
-from src.workflow import run_workflow
+import os
+import sys
+import asyncio
+
+from src.workflow import arun_workflow, run_workflow
+
+# Test inputs
+SHORT_INPUT = "Summarize in one sentence: Floop orchestrates multiple AI model interactions in a modular workflow."
+LONG_INPUT = "Summarize this: Floop is a system that orchestrates multiple AI model interactions in a modular workflow. It allows users to leverage multiple LLMs in a coordinated pipeline for complex tasks on their local environment, ensuring control, flexibility, and privacy."
+INPUTS = [SHORT_INPUT, LONG_INPUT]
+
+# Console header listing the inputs, built once at import
+_RUN_MSG = "Testing workflow orchestrator...\n" + "".join(
+    f"Running workflow with input: '{input_text[:50]}...'\n"
+    for input_text in INPUTS
+)
+
+def _require_api_key():
+    """Skip the calling test when no Anthropic API key is configured."""
+    if not os.getenv("ANTHROPIC_API_KEY"):
+        import pytest
+        pytest.skip("ANTHROPIC_API_KEY is not set")
 
-def main():
+def test_workflow_claude_short():
+    """Test the workflow orchestrator with a short input."""
+    _require_api_key()
+    result = run_workflow(input_text=SHORT_INPUT, model="claude")
+    assert "error" not in result, result["error"]
+    assert isinstance(result["output"], str) and result["output"]
+
+def test_workflow_claude_long():
+    """Test the workflow orchestrator with a longer input."""
+    _require_api_key()
+    result = run_workflow(input_text=LONG_INPUT, model="claude")
+    assert "error" not in result, result["error"]
+    assert isinstance(result["output"], str) and result["output"]
+
+async def main():
     """Main function to test the workflow orchestrator."""
-    print("Testing workflow orchestrator...")
-    
-    # Test input
-    input_text = "Summarize this: Floop is a system that orchestrates multiple AI model interactions in a modular workflow. It allows users to leverage multiple LLMs in a coordinated pipeline for complex tasks on their local environment, ensuring control, flexibility, and privacy."
-    print(f"Running workflow with input: '{input_text[:50]}...'")
-    
-    result = run_workflow(input_text=input_text, model="claude")
-    
-    # Print the result
-    print("\nResult:")
-    print(result.get("text", "No result"))
-    
-    print("\n✅ Workflow completed successfully!")
+    # Show what is running before waiting on the workflows
+    sys.stdout.write(_RUN_MSG)
+    sys.stdout.flush()
+
+    results = await asyncio.gather(*(arun_workflow(input_text=input_text, model="claude", cached=True) for input_text in INPUTS))
+
+    # Print the results
+    sys.stdout.write("".join(
+        f"\nResult:\n{result.get('output', result.get('error', 'No result'))}\n"
+        for result in results
+    ) + "\n✅ Workflow completed successfully!\n")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    asyncio.run(main())
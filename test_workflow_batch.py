@@ -0,0 +1,33 @@
+"""
+Test script for batch workflows.
+
+This script tests the workflow orchestrator by sending the workflow test inputs to Claude
+as a single message batch. Batch jobs may take a while to complete.
+"""
+
+import sys
+
+from src.workflow import run_workflow_batch
+from test_workflow import INPUTS
+
+# Result headers naming each input, built once at import
+_RESULT_HEADERS = [f"\nResult for '{input_text[:50]}...':\n" for input_text in INPUTS]
+
+def main():
+    """Main function to test batch workflows."""
+    print(f"Testing batch workflow with {len(INPUTS)} inputs...")
+
+    results = run_workflow_batch(INPUTS, "claude")
+
+    # Print the results
+    if any("error" in result for result in results):
+        status = "\n❌ Batch workflow completed with errors\n"
+    else:
+        status = "\n✅ Batch workflow completed successfully!\n"
+    sys.stdout.write("".join(
+        f"{header}{result.get('output', result.get('error', 'No result'))}\n"
+        for header, result in zip(_RESULT_HEADERS, results)
+    ) + status)
+
+if __name__ == "__main__":
+    main()